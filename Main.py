@@ -1,18 +1,275 @@
+import asyncio
+import csv
+import io
+import re
+import threading
+from collections import OrderedDict
 import streamlit as st
-import pandas as pd
 import json
-import math
 
 from utils import config
 from engines.stt_realtime import create_integrated_input_component, create_example_queries_section
 #from engines.stt_realtime_1 import create_integrated_input_component, create_example_queries_section
-from engines.llm_local import parse_query_with_ollama
-from engines.llm_openai import parse_query_with_openai
+from engines.llm_local import aparse_query_with_ollama
+from engines.llm_openai import aparse_query_with_openai
 from engines.query_builder import build_mongo_query, translate_synonyms
-from data.ingest_to_mongo import query_crime_data
-from utils.language_utils import detect_language, translate_text
+from data.ingest_to_mongo import query_crime_data, count_crime_data
+from utils.language_utils import detect_language, atranslate_text
 from utils.logger import log_error
 
+
+# Static page styling; Streamlit drops elements that aren't re-emitted,
+# so this is sent on every rerun but only built once at import
+APP_CSS = """
+<style>
+.main-header {
+    text-align: center;
+    padding: 1rem 0;
+    margin-bottom: 2rem;
+}
+.section-header {
+    background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    padding: 0.5rem 1rem;
+    border-radius: 10px;
+    margin: 1rem 0;
+}
+.info-card {
+    background: #f8f9fa;
+    padding: 1rem;
+    border-radius: 10px;
+    border-left: 4px solid #667eea;
+    margin: 0.5rem 0;
+}
+.stButton > button {
+    border-radius: 20px;
+    height: 2.5rem;
+    background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    border: none;
+    font-weight: bold;
+    transition: all 0.3s ease;
+}
+.stButton > button:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+}
+.clear-button > button {
+    background: linear-gradient(90deg, #dc3545 0%, #c82333 100%) !important;
+    color: white !important;
+}
+.clear-button > button:hover {
+    background: linear-gradient(90deg, #c82333 0%, #a71e2a 100%) !important;
+    transform: translateY(-2px);
+    box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+}
+.voice-status {
+    background: #e8f5e8;
+    padding: 0.5rem;
+    border-radius: 8px;
+    border-left: 4px solid #28a745;
+    margin: 0.5rem 0;
+}
+.error-status {
+    background: #ffe6e6;
+    padding: 0.5rem;
+    border-radius: 8px;
+    border-left: 4px solid #dc3545;
+    margin: 0.5rem 0;
+}
+</style>
+"""
+
+# Parsed-query info cards: (label, keys tried in order)
+FIELDS = (
+    ("🔍 Crime Category", ("crime_category", "crime_subcategory")),
+    ("📍 Location", ("location",)),
+    ("📅 Date", ("date",)),
+    ("📊 Status", ("status",)),
+    ("👮 Reported By", ("reported_by",)),
+    ("📝 Description", ("description",)),
+)
+KEYS = tuple(key for _, keys in FIELDS for key in keys)
+
+WELCOME_MD = """
+**Text Input:**
+- Type your query in the text box and click the send button (📤)
+
+**Voice Input:**
+- Select your language from the dropdown
+- Click the microphone button (🎤) and speak your query
+- Review the transcribed text and click "Use This" to apply it
+
+**Clear Data:**
+- Click the red "🗑️ Clear" button to clear the input and reset results
+
+**Multi-language Support:**
+- Voice input supports 12+ languages including English, Spanish, French, German, Italian, Portuguese, Russian, Japanese, Korean, Chinese, Hindi, and Arabic
+- Text queries are automatically translated to English if needed
+
+**Sample queries:**
+- "Show me burglaries in downtown last month"  
+- "Robos en Madrid desde enero" (Spanish)
+- "Vol à Paris cette semaine" (French)
+- "Diebstahl in Berlin" (German)
+"""
+
+
+# Explicit separators between independent requests in one submission. Plain
+# "and" is not used: it usually joins parts of a single query ("theft and
+# burglary in Mumbai") and splitting there would drop the shared criteria.
+COMPOUND_SEPARATOR_RE = re.compile(r"\s*(?:;|\n)\s*")
+
+
+def split_compound_query(query):
+    """Split a submission into independent sub-queries on ';' or new lines."""
+    return [clause for clause in COMPOUND_SEPARATOR_RE.split(query) if clause]
+
+
+async def parse_queries_batch(queries, llm_engine, model_name):
+    """Parse several queries with all LLM requests in flight at once."""
+    aparse = aparse_query_with_ollama if llm_engine == "ollama" else aparse_query_with_openai
+    return await asyncio.gather(*(aparse(query, model_name) for query in queries))
+
+
+async def process_query_async(query, llm_engine, model_name, translate, on_token=None):
+    """
+    Detect the language, translate and parse a query.
+    Translation is started speculatively alongside detection and dropped for
+    English input. `on_token` receives the streamed LLM output so far.
+    Sub-queries separated by ';' or new lines are parsed concurrently and
+    returned as {"clauses": [...]}.
+    Returns (detected_lang, processed_query, parsed_query).
+    """
+    translate_task = None
+    if translate:
+        translate_task = asyncio.create_task(atranslate_text(query, target_lang='en'))
+
+    detected_lang = await asyncio.to_thread(detect_language, query)
+
+    processed_query = query
+    if translate_task:
+        if detected_lang != 'en':
+            processed_query = await translate_task
+        else:
+            translate_task.cancel()
+
+    clauses = split_compound_query(processed_query)
+    if len(clauses) > 1:
+        # Compound submission: parse every sub-query concurrently
+        parsed_clauses = await parse_queries_batch(clauses, llm_engine, model_name)
+        failed = next((parsed for parsed in parsed_clauses if "error" in parsed), None)
+        parsed_query = failed or {"clauses": parsed_clauses}
+    elif llm_engine == "ollama":
+        parsed_query = await aparse_query_with_ollama(processed_query, model_name, on_token=on_token)
+    else:
+        parsed_query = await aparse_query_with_openai(processed_query, model_name, on_token=on_token)
+
+    return detected_lang, processed_query, parsed_query
+
+
+def normalize_query(query):
+    """Lowercase and collapse whitespace so trivially different repeats share a cache entry."""
+    return " ".join(query.lower().split())
+
+
+class QueryParseError(Exception):
+    """Raised by analyze_query for a failed parse so it isn't cached."""
+
+    def __init__(self, result):
+        super().__init__(result[2].get("error"))
+        self.result = result
+
+
+# LRU of (normalized query, engine, model, translate) -> analysis, shared by all
+# sessions. Not st.cache_data: the miss path streams into a Streamlit element,
+# which cache_data would record and fail to replay on a hit.
+ANALYSIS_CACHE_SIZE = 256
+_analysis_cache = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+
+def analyze_query(query, llm_engine, model_name, translate, on_token=None):
+    """
+    Cached process_query_async, keyed on the normalized query and engine settings.
+    The original query is what gets sent to the LLM, and on a miss `on_token`
+    receives the LLM output as it streams in.
+    Raises QueryParseError instead of returning a failed parse, which isn't cached.
+    """
+    key = (normalize_query(query), llm_engine, model_name, translate)
+    with _analysis_cache_lock:
+        if key in _analysis_cache:
+            _analysis_cache.move_to_end(key)
+            return _analysis_cache[key]
+
+    result = asyncio.run(process_query_async(query, llm_engine, model_name, translate, on_token=on_token))
+    if "error" in result[2]:
+        raise QueryParseError(result)
+
+    with _analysis_cache_lock:
+        _analysis_cache[key] = result
+        if len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+    return result
+
+
+# Fields shown in the results table (the Mongo ObjectId is left out)
+RESULT_PROJECTION = {"_id": 0}
+
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def cached_query_crime_data(mongo_query, skip=0, limit=0, projection=None):
+    """Cached query_crime_data so reruns and repeat queries skip the database; errors raise and aren't cached."""
+    return query_crime_data(mongo_query, skip=skip, limit=limit, projection=projection, raise_errors=True)
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def export_results_csv(mongo_query):
+    """Serialize the full result set of a query to CSV, once per query."""
+    results = cached_query_crime_data(mongo_query)
+    fieldnames = list(dict.fromkeys(key for record in results for key in record))
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    writer.writerows(results)
+    return buffer.getvalue()
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def export_results_json(mongo_query):
+    """Serialize the full result set of a query to JSON, once per query."""
+    return json.dumps(cached_query_crime_data(mongo_query), indent=2, ensure_ascii=False)
+
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def cached_count_crime_data(mongo_query):
+    """Cached count_crime_data for the pagination metadata; errors raise and aren't cached."""
+    return count_crime_data(mongo_query, raise_errors=True)
+
+
+# Session state restored by the Clear button (only keys that already exist are touched)
+_RESET_DEFAULTS = {
+    'current_query': "",
+    'query_input': "",
+    'voice_text': "",
+    'transcribed_text': "",
+    'submitted_query': "",
+    'pending_voice_text': "",
+    'voice_recording': False,
+    'show_voice_confirmation': False,
+    'voice_submitted_query': "",
+    'voice_auto_submit': False,
+    'clear_input': False,
+}
+
+
+def _clear_session():
+    """Reset the input/voice state, go back to page 1 and drop stored results."""
+    st.session_state.update({k: v for k, v in _RESET_DEFAULTS.items() if k in st.session_state})
+    st.session_state.page_number = 1
+    st.session_state.pop('results', None)
+
+
 def main():
     st.set_page_config(
         page_title="Crime Query Assistant",
@@ -21,65 +278,7 @@ def main():
     )
 
     # Custom CSS for better styling
-    st.markdown("""
-    <style>
-    .main-header {
-        text-align: center;
-        padding: 1rem 0;
-        margin-bottom: 2rem;
-    }
-    .section-header {
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 0.5rem 1rem;
-        border-radius: 10px;
-        margin: 1rem 0;
-    }
-    .info-card {
-        background: #f8f9fa;
-        padding: 1rem;
-        border-radius: 10px;
-        border-left: 4px solid #667eea;
-        margin: 0.5rem 0;
-    }
-    .stButton > button {
-        border-radius: 20px;
-        height: 2.5rem;
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        font-weight: bold;
-        transition: all 0.3s ease;
-    }
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-    }
-    .clear-button > button {
-        background: linear-gradient(90deg, #dc3545 0%, #c82333 100%) !important;
-        color: white !important;
-    }
-    .clear-button > button:hover {
-        background: linear-gradient(90deg, #c82333 0%, #a71e2a 100%) !important;
-        transform: translateY(-2px);
-        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-    }
-    .voice-status {
-        background: #e8f5e8;
-        padding: 0.5rem;
-        border-radius: 8px;
-        border-left: 4px solid #28a745;
-        margin: 0.5rem 0;
-    }
-    .error-status {
-        background: #ffe6e6;
-        padding: 0.5rem;
-        border-radius: 8px;
-        border-left: 4px solid #dc3545;
-        margin: 0.5rem 0;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(APP_CSS, unsafe_allow_html=True)
 
     # Main header
     st.markdown("<div class='main-header'>", unsafe_allow_html=True)
@@ -153,20 +352,7 @@ def main():
 
     # Handle clear button action
     if st.session_state.get('clear_input', False):
-        # Clear any relevant session state variables
-        if 'query_input' in st.session_state:
-            st.session_state.query_input = ""
-        if 'voice_text' in st.session_state:
-            st.session_state.voice_text = ""
-        if 'transcribed_text' in st.session_state:
-            st.session_state.transcribed_text = ""
-        if 'submitted_query' in st.session_state:
-            st.session_state.submitted_query = ""
-        if 'page_number' in st.session_state:
-            st.session_state.page_number = 1
-
-        # Reset the clear flag
-        st.session_state.clear_input = False
+        _clear_session()
         st.rerun()
 
     # Create input section with clear button
@@ -179,50 +365,19 @@ def main():
     with col_clear:
         st.markdown("<br>", unsafe_allow_html=True)  # Add some vertical spacing
         if st.button("🗑️ Clear", key="clear_button", help="Clear input and results", use_container_width=True):
-            # Reset all relevant session state variables
-            keys_to_reset = [
-                'current_query',
-                'query_input',
-                'voice_text',
-                'transcribed_text', 
-                'submitted_query',
-                'pending_voice_text',
-                'voice_recording',
-                'show_voice_confirmation',
-                'voice_submitted_query',
-                'voice_auto_submit'
-            ]
-            
-            for key in keys_to_reset:
-                if key in st.session_state:
-                    if isinstance(st.session_state[key], bool):
-                        st.session_state[key] = False
-                    elif isinstance(st.session_state[key], (int, float)):
-                        st.session_state[key] = 0
-                    else:
-                        st.session_state[key] = ""
-            
-            # Reset page number to 1
-            st.session_state.page_number = 1
-            
-            # Clear any stored results
-            if 'results' in st.session_state:
-                del st.session_state.results
-                
+            _clear_session()
+
             # Force an immediate rerun to refresh the UI
             st.rerun()
 
-    # Alternative approach: Add CSS class to the clear button for custom styling
-    st.markdown("""
-    <script>
-    document.addEventListener('DOMContentLoaded', function() {
-        const clearButton = document.querySelector('[data-testid="stButton"][title*="Clear"]');
-        if (clearButton) {
-            clearButton.classList.add('clear-button');
-        }
-    });
-    </script>
-    """, unsafe_allow_html=True)
+    # The input component only returns the query on the run it was submitted;
+    # keep it in session state so pagination and download reruns still show results
+    if submitted_query:
+        if submitted_query != st.session_state.get('submitted_query'):
+            st.session_state.page_number = 1
+        st.session_state.submitted_query = submitted_query
+    else:
+        submitted_query = st.session_state.get('submitted_query')
 
     # Example queries section
     create_example_queries_section()
@@ -238,97 +393,61 @@ def main():
 
         with col1:
             try:
-                # Detect language
-                detected_lang = detect_language(submitted_query)
-                st.info(f"🌐 **Detected language:** {detected_lang.upper()}")
+                # Detect language, translate and parse with the LLM
+                # Live preview of the LLM output, only written to on a cache miss
+                preview = st.empty()
+                with st.spinner("🤖 Analyzing query with AI..."):
+                    try:
+                        detected_lang, processed_query, parsed_query = analyze_query(
+                            submitted_query, llm_engine, model_name, translate_to_english,
+                            on_token=lambda text: preview.code(text, language="json"),
+                        )
+                    except QueryParseError as e:
+                        # Failed parses are shown but never cached
+                        detected_lang, processed_query, parsed_query = e.result
+                preview.empty()
 
-                # Translate if needed
-                processed_query = submitted_query
+                st.info(f"🌐 **Detected language:** {detected_lang.upper()}")
                 if translate_to_english and detected_lang != 'en':
-                    with st.spinner("🔄 Translating query..."):
-                        processed_query = translate_text(submitted_query, target_lang='en')
                     st.success(f"🔄 **Translated query:** {processed_query}")
 
-                # Parse query with LLM
-                with st.spinner("🤖 Analyzing query with AI..."):
-                    if llm_engine == "ollama":
-                        parsed_query = parse_query_with_ollama(processed_query, model_name)
-                    else:
-                        parsed_query = parse_query_with_openai(processed_query, model_name)
-
                 # Handle synonyms
-                parsed_query = translate_synonyms(parsed_query)
+                clauses = [translate_synonyms(clause) for clause in parsed_query.get("clauses", [parsed_query])]
 
                 # Display query info
                 with query_info_placeholder.container():
                     if "error" not in parsed_query:
                         st.markdown("**📋 Parsed Query Components:**")
 
-                        # Display as organized info cards
-                        components_found = False
-
-                        if parsed_query.get("crime_category") or parsed_query.get("crime_subcategory"):
-                            crime_type = parsed_query.get("crime_category") or parsed_query.get("crime_subcategory")
-                            st.markdown(f"""
-                            <div class='info-card'>
-                                <strong>🔍 Crime Category:</strong> <code>{crime_type}</code>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            components_found = True
-
-                        if parsed_query.get("location"):
-                            st.markdown(f"""
-                            <div class='info-card'>
-                                <strong>📍 Location:</strong> <code>{parsed_query['location']}</code>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            components_found = True
-
-                        if parsed_query.get("date"):
-                            st.markdown(f"""
-                            <div class='info-card'>
-                                <strong>📅 Date:</strong> <code>{parsed_query['date']}</code>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            components_found = True
-
-                        if parsed_query.get("status"):
-                            st.markdown(f"""
-                            <div class='info-card'>
-                                <strong>📊 Status:</strong> <code>{parsed_query['status']}</code>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            components_found = True
-
-                        if parsed_query.get("reported_by"):
-                            st.markdown(f"""
-                            <div class='info-card'>
-                                <strong>👮 Reported By:</strong> <code>{parsed_query['reported_by']}</code>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            components_found = True
-
-                        if parsed_query.get("description"):
-                            st.markdown(f"""
-                            <div class='info-card'>
-                                <strong>📝 Description:</strong> <code>{parsed_query['description']}</code>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            components_found = True
-
-                        if not components_found:
-                            st.warning("⚠️ No specific query components identified. Using general search.")
+                        for i, clause in enumerate(clauses, start=1):
+                            if len(clauses) > 1:
+                                st.markdown(f"*Query {i}:*")
+
+                            # Display as organized info cards, sent as a single element
+                            components_found = any(clause.get(k) for k in KEYS)
+                            if components_found:
+                                cards = []
+                                for label, keys in FIELDS:
+                                    value = next((clause[k] for k in keys if clause.get(k)), None)
+                                    if value:
+                                        cards.append(f"<div class='info-card'><strong>{label}:</strong> <code>{value}</code></div>")
+                                st.markdown("\n".join(cards), unsafe_allow_html=True)
+                            else:
+                                st.warning("⚠️ No specific query components identified. Using general search.")
 
                         # Show raw JSON in expander
                         with st.expander("📄 View Raw Parsed Data"):
-                            st.json(parsed_query)
+                            st.json(clauses if len(clauses) > 1 else clauses[0])
                     else:
                         st.error("❌ Error parsing query")
                         st.json(parsed_query)
 
                 # Build and execute MongoDB query
                 if "error" not in parsed_query:
-                    mongo_query = build_mongo_query(parsed_query)
+                    if len(clauses) > 1:
+                        mongo_query = {"$or": [build_mongo_query(clause) for clause in clauses]}
+                    else:
+                        mongo_query = build_mongo_query(clauses[0])
 
                     with st.expander("🗃️ View MongoDB Query"):
                         st.json(mongo_query)
@@ -338,10 +457,9 @@ def main():
 
                     try:
                         with st.spinner("🔍 Searching database..."):
-                            results = query_crime_data(mongo_query)
+                            total_results = cached_count_crime_data(mongo_query)
 
-                        if results:
-                            total_results = len(results)
+                        if total_results:
 
                             # Results summary
                             col1, col2, col3 = st.columns(3)
@@ -350,12 +468,13 @@ def main():
                             with col2:
                                 st.metric("📄 Results per Page", results_per_page)
                             with col3:
-                                total_pages = math.ceil(total_results / results_per_page)
+                                total_pages = (total_results + results_per_page - 1) // results_per_page
                                 st.metric("📚 Total Pages", total_pages)
 
                             # Pagination
                             if 'page_number' not in st.session_state:
                                 st.session_state.page_number = 1
+                            st.session_state.page_number = min(st.session_state.page_number, total_pages)
 
                             if total_pages > 1:
                                 col_prev, col_info, col_next = st.columns([1, 2, 1])
@@ -373,16 +492,20 @@ def main():
                                         st.session_state.page_number += 1
                                         st.rerun()
 
-                            # Calculate pagination bounds
+                            # Fetch only the current page from MongoDB
                             start_idx = (st.session_state.page_number - 1) * results_per_page
-                            end_idx = min(start_idx + results_per_page, total_results)
+                            with st.spinner("🔍 Loading page..."):
+                                paginated_results = cached_query_crime_data(
+                                    mongo_query, skip=start_idx, limit=results_per_page, projection=RESULT_PROJECTION
+                                )
+                            end_idx = start_idx + len(paginated_results)
 
-                            # Display paginated results
-                            paginated_results = results[start_idx:end_idx]
-                            df = pd.DataFrame(paginated_results)
+                            # Display paginated results as columns (records can have differing fields)
+                            columns = dict.fromkeys(key for record in paginated_results for key in record)
+                            page_data = {key: [record.get(key) for record in paginated_results] for key in columns}
 
                             st.dataframe(
-                                df,
+                                page_data,
                                 use_container_width=True,
                                 height=400
                             )
@@ -390,28 +513,30 @@ def main():
                             # Show pagination info
                             st.info(f"📋 Showing results {start_idx + 1}-{end_idx} of {total_results}")
 
-                            # Download options
+                            # Download options; the full result set is only fetched on request
                             st.markdown("### 📥 Download Results")
-                            col_csv, col_json = st.columns(2)
-                            with col_csv:
-                                csv_data = pd.DataFrame(results).to_csv(index=False)
-                                st.download_button(
-                                    "📊 Download All Results (CSV)",
-                                    csv_data,
-                                    "crime_query_results.csv",
-                                    "text/csv",
-                                    use_container_width=True
-                                )
-
-                            with col_json:
-                                json_data = json.dumps(results, indent=2, ensure_ascii=False)
-                                st.download_button(
-                                    "📄 Download All Results (JSON)",
-                                    json_data,
-                                    "crime_query_results.json",
-                                    "application/json",
-                                    use_container_width=True
-                                )
+                            if st.button("📥 Prepare Download of All Results", key="prepare_download"):
+                                with st.spinner("🔍 Fetching all results..."):
+                                    csv_data = export_results_csv(mongo_query)
+                                    json_data = export_results_json(mongo_query)
+                                col_csv, col_json = st.columns(2)
+                                with col_csv:
+                                    st.download_button(
+                                        "📊 Download All Results (CSV)",
+                                        csv_data,
+                                        "crime_query_results.csv",
+                                        "text/csv",
+                                        use_container_width=True
+                                    )
+
+                                with col_json:
+                                    st.download_button(
+                                        "📄 Download All Results (JSON)",
+                                        json_data,
+                                        "crime_query_results.json",
+                                        "application/json",
+                                        use_container_width=True
+                                    )
                         else:
                             st.warning("⚠️ No results found for your query.")
                             st.info("""
@@ -436,28 +561,7 @@ def main():
         st.info("Enter a query above using text input or voice input to search the crime database.")
 
         st.markdown("### 📖 How to use:")
-        st.markdown("""
-        **Text Input:**
-        - Type your query in the text box and click the send button (📤)
-
-        **Voice Input:**
-        - Select your language from the dropdown
-        - Click the microphone button (🎤) and speak your query
-        - Review the transcribed text and click "Use This" to apply it
-
-        **Clear Data:**
-        - Click the red "🗑️ Clear" button to clear the input and reset results
-
-        **Multi-language Support:**
-        - Voice input supports 12+ languages including English, Spanish, French, German, Italian, Portuguese, Russian, Japanese, Korean, Chinese, Hindi, and Arabic
-        - Text queries are automatically translated to English if needed
-
-        **Sample queries:**
-        - "Show me burglaries in downtown last month"  
-        - "Robos en Madrid desde enero" (Spanish)
-        - "Vol à Paris cette semaine" (French)
-        - "Diebstahl in Berlin" (German)
-        """)
+        st.markdown(WELCOME_MD)
 
 
 if __name__ == "__main__":
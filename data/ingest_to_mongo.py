@@ -4,6 +4,7 @@ import json
 import os
 import sys
 from datetime import datetime
+from functools import lru_cache
 
 # Adjust sys.path if needed for your project structure
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -12,18 +13,80 @@ from utils import config
 from utils.logger import log_info, log_error
 from engines.data_handler import DynamicDataHandler
 
+# Fields the query builder filters on most often
+INDEXED_FIELDS = ("crime_category", "location", "date")
+
+# Fields also stored lower-cased as "<field>_lc"; an anchored regex such as
+# {"crime_category_lc": {"$regex": "^theft"}} is an index range scan, unlike
+# a case-insensitive regex on the original field
+LOWERCASE_FIELDS = ("crime_category", "city")
+
+# Date-range queries that also filter on category/city are resolved from
+# this one index without fetching non-matching documents
+COMPOUND_INDEX = [("date", pymongo.ASCENDING), ("crime_category", pymongo.ASCENDING), ("city", pymongo.ASCENDING)]
+
+@lru_cache(maxsize=1)
+def get_client():
+    """
+    MongoClient shared by the whole process. pymongo clients are thread-safe
+    and pool connections, so every app session, ingest and test reuses the
+    same connections instead of reconnecting (and re-handshaking) per call.
+    """
+    client = pymongo.MongoClient(
+        config.MONGODB_URI,
+        maxPoolSize=config.MONGODB_MAX_POOL_SIZE,
+        compressors=config.MONGODB_COMPRESSORS or None
+    )
+    log_info(f"Connected to MongoDB: {config.MONGODB_URI} -> DB: {config.MONGODB_DB_NAME} | Collection: {config.MONGODB_COLLECTION_NAME}")
+    return client
+
 def connect_to_mongodb():
-    """Connect to MongoDB database."""
+    """Connect to MongoDB database. The client is shared; callers must not close it."""
     try:
-        client = pymongo.MongoClient(config.MONGODB_URI)
+        client = get_client()
         db = client[config.MONGODB_DB_NAME]
         collection = db[config.MONGODB_COLLECTION_NAME]
-        log_info(f"Connected to MongoDB: {config.MONGODB_URI} -> DB: {config.MONGODB_DB_NAME} | Collection: {config.MONGODB_COLLECTION_NAME}")
         return client, db, collection
     except Exception as e:
         log_error(f"Error connecting to MongoDB: {str(e)}")
         return None, None, None
 
+@lru_cache(maxsize=1)
+def get_collection():
+    """
+    Crime collection on the shared client.
+    Collections ingested before the indexes existed get them here.
+    """
+    collection = get_client()[config.MONGODB_DB_NAME][config.MONGODB_COLLECTION_NAME]
+    create_indexes(collection)
+    return collection
+
+def warm_up_mongodb():
+    """Open a pooled connection ahead of time so the first timed query skips the handshake."""
+    try:
+        get_client().admin.command("ping")
+        return True
+    except Exception as e:
+        log_error(f"Error pinging MongoDB: {str(e)}")
+        return False
+
+def create_indexes(collection):
+    """Create single-field indexes on the common filter fields (no-op if they already exist)."""
+    for field in INDEXED_FIELDS:
+        collection.create_index([(field, pymongo.ASCENDING)])
+    for field in LOWERCASE_FIELDS:
+        collection.create_index([(f"{field}_lc", pymongo.ASCENDING)])
+    collection.create_index(COMPOUND_INDEX, name="date_type_city")
+
+def add_lowercase_fields(records):
+    """Add the "<field>_lc" copies of LOWERCASE_FIELDS to records before insert (in place)."""
+    for record in records:
+        for field in LOWERCASE_FIELDS:
+            value = record.get(field)
+            if isinstance(value, str):
+                record[f"{field}_lc"] = value.lower()
+    return records
+
 def create_sample_data():
     """Create sample multilingual crime data."""
     sample_data = [
@@ -134,9 +197,9 @@ def ingest_csv_to_mongo(csv_file_path: str):
                     except ValueError:
                         record['date'] = datetime.now()
 
-        result = collection.insert_many(records)
+        result = collection.insert_many(add_lowercase_fields(records))
+        create_indexes(collection)
         log_info(f"Inserted {len(result.inserted_ids)} records into MongoDB")
-        client.close()
         return True
 
     except Exception as e:
@@ -162,9 +225,9 @@ def ingest_json_to_mongo(json_file_path: str):
                     record['date_reported'] = datetime.now()
 
         collection.delete_many({})  # Clear old data
-        result = collection.insert_many(data)
+        result = collection.insert_many(add_lowercase_fields(data))
+        create_indexes(collection)
         log_info(f"Inserted {len(result.inserted_ids)} JSON records into MongoDB")
-        client.close()
         return True
 
     except Exception as e:
@@ -179,43 +242,125 @@ def ingest_sample_data():
             return False
 
         collection.delete_many({})
-        sample_data = create_sample_data()
+        sample_data = add_lowercase_fields(create_sample_data())
         result = collection.insert_many(sample_data)
+        create_indexes(collection)
         log_info(f"Inserted {len(result.inserted_ids)} sample records into MongoDB")
-        client.close()
         return True
 
     except Exception as e:
         log_error(f"Error ingesting sample data: {str(e)}")
         return False
 
-def query_crime_data(mongo_query: dict):
-    """Query crime data from MongoDB with enhanced dynamic data handling."""
+def query_crime_data(mongo_query: dict, skip: int = 0, limit: int = 0, projection: dict = None,
+                     raise_errors: bool = False):
+    """
+    Query crime data from MongoDB with enhanced dynamic data handling.
+    `skip`/`limit` page on the server (limit=0 means no limit) and
+    `projection` restricts the returned fields. Results are sorted newest first,
+    with _id as a tie-breaker so pages don't overlap or skip documents. Errors are logged and give []
+    unless `raise_errors` is set, e.g. for callers that cache the result.
+    """
     try:
-        client, db, collection = connect_to_mongodb()
-        if collection is None:
-            return []
-
-        cursor = collection.find(mongo_query)
-        results = list(cursor)
+        collection = get_collection()
+        cursor = (
+            collection.find(mongo_query, projection)
+            .sort([("date", pymongo.DESCENDING), ("_id", pymongo.ASCENDING)])
+            .skip(skip)
+            .limit(limit)
+        )
+        results = serialize_results(list(cursor))
 
-        # Convert ObjectId to string & datetime to string for JSON serialization
-        for result in results:
-            if '_id' in result:
-                result['_id'] = str(result['_id'])
-            if 'date' in result and isinstance(result['date'], datetime):
-                result['date'] = result['date'].strftime('%Y-%m-%d')
-            if 'date_reported' in result and isinstance(result['date_reported'], datetime):
-                result['date_reported'] = result['date_reported'].strftime('%Y-%m-%d')
-
-        client.close()
         log_info(f"Query returned {len(results)} results")
         return results
 
     except Exception as e:
         log_error(f"Error querying MongoDB: {str(e)}")
+        if raise_errors:
+            raise
+        return []
+
+def serialize_results(results):
+    """Convert ObjectId to string & datetime to string for JSON serialization (in place)."""
+    for result in results:
+        if '_id' in result:
+            result['_id'] = str(result['_id'])
+        if 'date' in result and isinstance(result['date'], datetime):
+            result['date'] = result['date'].strftime('%Y-%m-%d')
+        if 'date_reported' in result and isinstance(result['date_reported'], datetime):
+            result['date_reported'] = result['date_reported'].strftime('%Y-%m-%d')
+    return results
+
+def facet_count_crime_data(named_queries: dict, projection: dict = None) -> dict:
+    """
+    Count several queries and fetch one sample document each, in one round
+    trip with a $facet aggregation. Takes {name: mongo_query} and returns
+    {name: (count, [sample])}; `projection` restricts the sample's fields.
+    Only the counts and samples cross the wire, not the matched documents.
+    $facet branches cannot use indexes, so this suits small probes; use
+    count_crime_data / query_crime_data for index-driven queries.
+    """
+    try:
+        collection = get_collection()
+        branch_tail = [{"$project": projection}] if projection else []
+        branch_tail.append({"$group": {"_id": None, "count": {"$sum": 1}, "sample": {"$first": "$$ROOT"}}})
+        pipeline = [{"$facet": {name: [{"$match": query}] + branch_tail for name, query in named_queries.items()}}]
+        facets = next(collection.aggregate(pipeline), {})
+
+        summaries = {}
+        for name in named_queries:
+            groups = facets.get(name) or [{"count": 0, "sample": None}]
+            sample = groups[0]["sample"]
+            summaries[name] = (groups[0]["count"], serialize_results([sample]) if sample else [])
+        return summaries
+
+    except Exception as e:
+        log_error(f"Error running MongoDB facet query: {str(e)}")
+        return {name: (0, []) for name in named_queries}
+
+def aggregate_crime_data(pipeline: list):
+    """
+    Run an aggregation pipeline (e.g. from build_mongo_pipeline) and return
+    serialized results. Pipelines whose leading $match filters on date are
+    hinted to the date_type_city index, which also serves the date sort.
+    """
+    try:
+        collection = get_collection()
+        first_stage = pipeline[0] if pipeline else {}
+        if "date" in first_stage.get("$match", {}):
+            cursor = collection.aggregate(pipeline, hint="date_type_city")
+        else:
+            cursor = collection.aggregate(pipeline)
+        results = serialize_results(list(cursor))
+
+        log_info(f"Aggregation returned {len(results)} results")
+        return results
+
+    except Exception as e:
+        log_error(f"Error running MongoDB aggregation: {str(e)}")
         return []
 
+def count_crime_data(mongo_query: dict, raise_errors: bool = False) -> int:
+    """
+    Count the documents matching a query without fetching them.
+    Queries that filter on date are hinted to the date_type_city index, as in
+    aggregate_crime_data; everything else is left to the query planner.
+    Errors are logged and give 0 unless `raise_errors` is set.
+    """
+    try:
+        collection = get_collection()
+        if "date" in mongo_query:
+            total = collection.count_documents(mongo_query, hint="date_type_city")
+        else:
+            total = collection.count_documents(mongo_query)
+        return total
+
+    except Exception as e:
+        log_error(f"Error counting MongoDB documents: {str(e)}")
+        if raise_errors:
+            raise
+        return 0
+
 def query_with_dynamic_handler(query_data, search_terms=None):
     """
     Query crime data using the dynamic data handler.
@@ -256,17 +401,13 @@ def query_with_dynamic_handler(query_data, search_terms=None):
 def get_database_stats():
     """Get database statistics."""
     try:
-        client, db, collection = connect_to_mongodb()
-        if collection is None:
-            return {}
-
+        collection = get_collection()
         stats = {
             "total_records": collection.count_documents({}),
             "crime_categorys": list(collection.distinct("crime_category")),
             "cities": list(collection.distinct("city")),
             "statuses": list(collection.distinct("status"))
         }
-        client.close()
         return stats
 
     except Exception as e:
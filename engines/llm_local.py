@@ -1,22 +1,13 @@
-from langchain_community.llms import Ollama
-#import Ollama
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
+import asyncio
 import json
 import re
+import ollama
 
-def parse_query_with_ollama(user_query: str, model_name: str = "llama3"): # type: ignore
-    """
-    Parse user query using Ollama local LLM to extract crime query parameters.
-    """
-    #llm = Ollama(model=model_name)
-    llm = Ollama(model=model_name, base_url="http://localhost:11434")
-
-    # Prompt needs to be refined further
-    # Prompt to LLM, can be changed and needs to be generalized in the future as currently its too specific to the dataset
-    prompt_template = PromptTemplate(
-        input_variables=["query"],
-        template="""
+OLLAMA_BASE_URL = "http://localhost:11434"
+
+# Prompt needs to be refined further
+# Prompt to LLM, can be changed and needs to be generalized in the future as currently its too specific to the dataset
+PARSE_PROMPT_TEMPLATE = """
         
          You are a multilingual crime data query parser. Extract the following information from the user query and return it as a JSON object:
 
@@ -36,12 +27,38 @@ def parse_query_with_ollama(user_query: str, model_name: str = "llama3"): # type
         Respond **only** with a valid JSON object, no additional explanations, formatting, or commentary.
         
         """
-    )
-    
-    chain = LLMChain(llm=llm, prompt=prompt_template)
-    response = chain.run(query=user_query)
-    
-    # Extract JSON from response
+
+
+def parse_query_with_ollama(user_query: str, model_name: str = "llama3"): # type: ignore
+    """
+    Parse user query using Ollama local LLM to extract crime query parameters.
+    Blocking wrapper around aparse_query_with_ollama.
+    """
+    return asyncio.run(aparse_query_with_ollama(user_query, model_name))
+
+
+async def aparse_query_with_ollama(user_query: str, model_name: str = "llama3", on_token=None): # type: ignore
+    """
+    Parse a query with ollama.AsyncClient so several prompts can be awaited
+    together; the server only runs them in parallel with OLLAMA_NUM_PARALLEL > 1.
+    The response is streamed; `on_token` is called with the text so far.
+    The client is closed on return, so batched calls don't leak connection pools.
+    """
+    response = ""
+    async with ollama.AsyncClient(host=OLLAMA_BASE_URL) as client:
+        stream = await client.generate(model=model_name, prompt=PARSE_PROMPT_TEMPLATE.format(query=user_query), stream=True)
+        async for chunk in stream:
+            response += chunk["response"]
+            if on_token:
+                on_token(response)
+
+    return extract_json_response(response)
+
+
+def extract_json_response(response: str):
+    """
+    Pull the JSON object out of a raw LLM response.
+    """
     try:
         # Try to find JSON in the response
         json_match = re.search(r'\{.*\}', response, re.DOTALL)
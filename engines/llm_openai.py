@@ -1,6 +1,7 @@
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langchain.chains import LLMChain
+from openai import AsyncOpenAI
 import json
 import re
 import os
@@ -8,20 +9,9 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-def parse_query_with_openai(user_query: str, model_name: str = "gpt-3.5-turbo"): # type: ignore
-    """
-    Parse user query using OpenAI LLM to extract crime query parameters.
-    """
-    # Use environment variable for API key
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        return {"error": "OpenAI API key not found in environment variables"}
-    
-    llm = ChatOpenAI(model=model_name, openai_api_key=api_key)
-
-    # Prompt needs to be refined further
-    # Prompt to LLM, can be changed and needs to be generalized in the future as currently its too specific to the dataset
-    prompt_template = ChatPromptTemplate.from_template("""
+# Prompt needs to be refined further
+# Prompt to LLM, can be changed and needs to be generalized in the future as currently its too specific to the dataset
+PARSE_PROMPT_TEMPLATE = """
 
         You are a multilingual crime data query parser. Your task is to extract structured information from a user query about crime data and return it as a JSON object with the following fields:
 
@@ -40,12 +30,58 @@ def parse_query_with_openai(user_query: str, model_name: str = "gpt-3.5-turbo"):
 
         Respond **only** with a valid JSON object, no additional explanations, formatting, or commentary.
 
-    """)
+    """
+
+
+def parse_query_with_openai(user_query: str, model_name: str = "gpt-3.5-turbo"): # type: ignore
+    """
+    Parse user query using OpenAI LLM to extract crime query parameters.
+    """
+    # Use environment variable for API key
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return {"error": "OpenAI API key not found in environment variables"}
+    
+    llm = ChatOpenAI(model=model_name, openai_api_key=api_key)
+
+    prompt_template = ChatPromptTemplate.from_template(PARSE_PROMPT_TEMPLATE)
     
     chain = LLMChain(llm=llm, prompt=prompt_template)
     response = chain.run(query=user_query)
     
-    # Extract JSON from response
+    return extract_json_response(response)
+
+
+async def aparse_query_with_openai(user_query: str, model_name: str = "gpt-3.5-turbo", on_token=None): # type: ignore
+    """
+    Async variant of parse_query_with_openai using the native AsyncOpenAI client.
+    The response is streamed; `on_token` is called with the text so far.
+    The client is closed on return, so batched calls don't leak connection pools.
+    """
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return {"error": "OpenAI API key not found in environment variables"}
+
+    response = ""
+    async with AsyncOpenAI(api_key=api_key) as client:
+        stream = await client.chat.completions.create(
+            model=model_name,
+            messages=[{"role": "user", "content": PARSE_PROMPT_TEMPLATE.format(query=user_query)}],
+            stream=True,
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                response += chunk.choices[0].delta.content
+                if on_token:
+                    on_token(response)
+
+    return extract_json_response(response)
+
+
+def extract_json_response(response: str):
+    """
+    Pull the JSON object out of a raw LLM response.
+    """
     try:
         # Try to find JSON in the response
         json_match = re.search(r'\{.*\}', response, re.DOTALL)
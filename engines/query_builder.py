@@ -1,56 +1,70 @@
 from datetime import datetime
 import re
 
+# parsed_query keys build_mongo_query understands, in the order their filters are added
+QUERY_KEYS = ("crime_category", "location", "date_start", "date_end", "status", "reported_by")
+
+def _regex(value: str) -> dict:
+    """Case-insensitive regex condition."""
+    return {"$regex": value, "$options": "i"}
+
+def _crime_category_filter(mongo_query: dict, crime_category: str):
+    # Use regex for fuzzy matching
+    mongo_query["crime_category"] = _regex(crime_category.lower())
+
+def _location_filter(mongo_query: dict, location: str):
+    location = location.lower()
+    mongo_query["$or"] = [
+        {"city": _regex(location)},
+        {"location": _regex(location)},
+        {"address": _regex(location)}
+    ]
+
+def _date_bound_filter(operator: str):
+    """Filter builder adding one bound of the date range."""
+    def add_bound(mongo_query: dict, value: str):
+        try:
+            mongo_query.setdefault("date", {})[operator] = datetime.strptime(value, "%Y-%m-%d")
+        except ValueError:
+            pass  # Invalid date format, skip
+    return add_bound
+
+def _field_regex_filter(field: str):
+    """Filter builder matching `field` case-insensitively."""
+    def add_regex(mongo_query: dict, value: str):
+        mongo_query[field] = _regex(value)
+    return add_regex
+
+_FILTER_BUILDERS = {
+    "crime_category": _crime_category_filter,
+    "location": _location_filter,
+    "date_start": _date_bound_filter("$gte"),
+    "date_end": _date_bound_filter("$lte"),
+    "status": _field_regex_filter("status"),
+    "reported_by": _field_regex_filter("reported_by"),
+}
+
 def build_mongo_query(parsed_query: dict): # type: ignore
     """
     Convert parsed query dictionary to MongoDB query.
     """
     mongo_query = {}
-    
-    # Handle crime type with fuzzy matching
-    if parsed_query.get("crime_category"):
-        crime_category = parsed_query["crime_category"].lower()
-        # Use regex for fuzzy matching
-        mongo_query["crime_category"] = {"$regex": crime_category, "$options": "i"}
-    
-    # Handle location with fuzzy matching
-    if parsed_query.get("location"):
-        location = parsed_query["location"].lower()
-        mongo_query["$or"] = [
-            {"city": {"$regex": location, "$options": "i"}},
-            {"location": {"$regex": location, "$options": "i"}},
-            {"address": {"$regex": location, "$options": "i"}}
-        ]
-    
-    # Handle date range
-    date_filter = {}
-    if parsed_query.get("date_start"):
-        try:
-            start_date = datetime.strptime(parsed_query["date_start"], "%Y-%m-%d")
-            date_filter["$gte"] = start_date
-        except ValueError:
-            pass  # Invalid date format, skip
-    
-    if parsed_query.get("date_end"):
-        try:
-            end_date = datetime.strptime(parsed_query["date_end"], "%Y-%m-%d")
-            date_filter["$lte"] = end_date
-        except ValueError:
-            pass  # Invalid date format, skip
-    
-    if date_filter:
-        mongo_query["date"] = date_filter
-    
-    # Handle status
-    if parsed_query.get("status"):
-        mongo_query["status"] = {"$regex": parsed_query["status"], "$options": "i"}
-    
-    # Handle reported_by
-    if parsed_query.get("reported_by"):
-        mongo_query["reported_by"] = {"$regex": parsed_query["reported_by"], "$options": "i"}
-    
+    for key in QUERY_KEYS:
+        if parsed_query.get(key):
+            _FILTER_BUILDERS[key](mongo_query, parsed_query[key])
     return mongo_query
 
+def build_mongo_pipeline(parsed_query: dict, limit: int = None) -> list:
+    """
+    Aggregation pipeline for a parsed query: $match first so it can use an
+    index, then newest-first $sort and an optional $limit directly after it,
+    which MongoDB coalesces into a top-k sort.
+    """
+    pipeline = [{"$match": build_mongo_query(parsed_query)}, {"$sort": {"date": -1}}]
+    if limit:
+        pipeline.append({"$limit": limit})
+    return pipeline
+
 def translate_synonyms(query_dict: dict): # type: ignore
     """
     Translate common crime type synonyms to standardized terms.
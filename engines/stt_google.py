@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import speech_recognition as sr
 
 def transcribe_google(audio_file_path: str, language: str = "en-US"): # type: ignore
@@ -15,3 +17,42 @@ def transcribe_google(audio_file_path: str, language: str = "en-US"): # type: ig
         return f"Could not request results from Google Speech Recognition service; {e}"
 
 
+@lru_cache(maxsize=1)
+def _get_speech_client():
+    """Google Cloud Speech client, created once (uses GOOGLE_APPLICATION_CREDENTIALS)."""
+    from google.cloud import speech_v1
+    return speech_v1.SpeechClient()
+
+
+def transcribe_google_streaming(source, language: str = "en-US", phrase_time_limit: int = 8): # type: ignore
+    """
+    Stream an open sr.Microphone to Google Cloud StreamingRecognize.
+    Audio is uploaded in 100 ms chunks while the user is still speaking, so
+    recognition overlaps capture. Returns the first final transcript.
+    """
+    from google.cloud import speech_v1
+
+    streaming_config = speech_v1.StreamingRecognitionConfig(
+        config=speech_v1.RecognitionConfig(
+            encoding=speech_v1.RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=source.SAMPLE_RATE,
+            language_code=language,
+        ),
+        interim_results=True,
+        single_utterance=True,  # server closes the stream at end of speech
+    )
+
+    chunk_frames = source.SAMPLE_RATE // 10
+    max_chunks = phrase_time_limit * 10
+
+    def audio_requests():
+        for _ in range(max_chunks):
+            yield speech_v1.StreamingRecognizeRequest(audio_content=source.stream.read(chunk_frames))
+
+    responses = _get_speech_client().streaming_recognize(streaming_config, audio_requests())
+    for response in responses:
+        for result in response.results:
+            if result.is_final and result.alternatives:
+                return result.alternatives[0].transcript
+
+    raise sr.UnknownValueError()
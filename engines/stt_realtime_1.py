@@ -2,14 +2,19 @@
 
 import streamlit as st
 import speech_recognition as sr
-import tempfile
-import os
+import numpy as np
+from functools import lru_cache
+from types import MappingProxyType
+from utils import config
 from utils.logger import log_info, log_error, log_stt_operation
 from utils.language_utils import detect_language
+from engines.stt_vad import listen_with_vad, VAD_AVAILABLE, VAD_SAMPLE_RATE, VAD_FRAME_SAMPLES
+from engines.stt_google import transcribe_google_streaming
+from engines.stt_whisper import transcribe_whisper, get_stt_model, get_onnx_stt_model, whisper_model_name
 import time
 
 # Language mapping for speech recognition with extensive Indian language support
-LANGUAGE_CODES = {
+LANGUAGE_CODES = MappingProxyType({
     # English
     'en': 'en-US',
     'en-in': 'en-IN',  # Indian English
@@ -90,20 +95,120 @@ LANGUAGE_CODES = {
     'lt': 'lt-LT',  # Lithuanian
     'mt': 'mt-MT',  # Maltese
     'is': 'is-IS',  # Icelandic
-}
+})
+
+
+# Voice language dropdown entries (Indian languages first). Kept at module
+# level so Streamlit reruns don't rebuild the dict or the options list.
+LANGUAGE_OPTIONS = MappingProxyType({
+    # Indian English
+    'en-in': '🇮🇳 Indian English',
+    'en': '🇺🇸 English (US)',
+
+    # Major Indian Languages (22 Official Languages)
+    'hi': '🇮🇳 हिन्दी (Hindi)',
+    'bn': '🇮🇳 বাংলা (Bengali)',
+    'te': '🇮🇳 తెలుగు (Telugu)',
+    'ta': '🇮🇳 தமிழ் (Tamil)',
+    'mr': '🇮🇳 मराठी (Marathi)',
+    'gu': '🇮🇳 ગુജરાતી (Gujarati)',
+    'kn': '🇮🇳 ಕನ್ನಡ (Kannada)',
+    'ml': '🇮🇳 മലയാളം (Malayalam)',
+    'or': '🇮🇳 ଓଡ଼ିଆ (Odia)',
+    'pa': '🇮🇳 ਪੰਜਾਬੀ (Punjabi)',
+    'as': '🇮🇳 অসমীয়া (Assamese)',
+    'ur': '🇮🇳 اردو (Urdu)',
+    'sa': '🇮🇳 संस्कृत (Sanskrit)',
+    'ks': '🇮🇳 कॉशुर (Kashmiri)',
+    'sd': '🇮🇳 سنڌي (Sindhi)',
+    'ne': '🇮🇳 नेपाली (Nepali)',
+    'mni': '🇮🇳 মেইতেই (Manipuri)',
+    'kok': '🇮🇳 कोंकणी (Konkani)',
+    'bodo': '🇮🇳 बड़ो (Bodo)',
+    'doi': '🇮🇳 डोगरी (Dogri)',
+    'mai': '🇮🇳 मैथिली (Maithili)',
+    'sat': '🇮🇳 ᱥᱟᱱᱛᱟᱲᱤ (Santali)',
+
+    # Regional Indian Languages
+    'bh': '🇮🇳 भोजपुरी (Bihari)',
+    'raj': '🇮🇳 राजस्थानी (Rajasthani)',
+    'bhb': '🇮🇳 भीली (Bhili)',
+    'gom': '🇮🇳 गोंयची कोंकणी (Goan Konkani)',
+    'tcy': '🇮🇳 ತುಳು (Tulu)',
+    'new': '🇮🇳 नेवारी (Newari)',
+
+    # International Languages
+    'ar': '🇸🇦 العربية (Arabic)',
+    'zh': '🇨🇳 中文 (Chinese)',
+    'zh-tw': '🇹🇼 繁體中文 (Traditional Chinese)',
+    'es': '🇪🇸 Español (Spanish)',
+    'fr': '🇫🇷 Français (French)',
+    'de': '🇩🇪 Deutsch (German)',
+    'it': '🇮🇹 Italiano (Italian)',
+    'pt': '🇧🇷 Português (Portuguese)',
+    'ru': '🇷🇺 Русский (Russian)',
+    'ja': '🇯🇵 日本語 (Japanese)',
+    'ko': '🇰🇷 한국어 (Korean)',
+    'th': '🇹🇭 ไทย (Thai)',
+    'vi': '🇻🇳 Tiếng Việt (Vietnamese)',
+    'id': '🇮🇩 Bahasa Indonesia',
+    'ms': '🇲🇾 Bahasa Melayu (Malay)',
+    'fil': '🇵🇭 Filipino',
+    'tr': '🇹🇷 Türkçe (Turkish)',
+    'fa': '🇮🇷 فارسی (Persian)',
+    'he': '🇮🇱 עברית (Hebrew)',
+    'sw': '🇰🇪 Kiswahili (Swahili)',
+    'pl': '🇵🇱 Polski (Polish)',
+    'nl': '🇳🇱 Nederlands (Dutch)',
+    'sv': '🇸🇪 Svenska (Swedish)',
+    'da': '🇩🇰 Dansk (Danish)',
+    'no': '🇳🇴 Norsk (Norwegian)',
+    'fi': '🇫🇮 Suomi (Finnish)',
+    'el': '🇬🇷 Ελληνικά (Greek)',
+    'cs': '🇨🇿 Čeština (Czech)',
+    'sk': '🇸🇰 Slovenčina (Slovak)',
+    'hu': '🇭🇺 Magyar (Hungarian)',
+    'ro': '🇷🇴 Română (Romanian)',
+})
+
+# Ordered (code, label) pairs for the dropdown plus a plain dict for label lookup
+_LANG_ENTRIES = tuple(LANGUAGE_OPTIONS.items())
+_LANG_CODES = tuple(code for code, _ in _LANG_ENTRIES)
+_LANG_LABELS = dict(_LANG_ENTRIES)
+
+
+@lru_cache(maxsize=None)
+def bcp47(code):
+    """Speech recognition locale (BCP-47) for a dropdown language code."""
+    return LANGUAGE_CODES.get(code, 'en-US')
+
+
+def get_recognizer():
+    """
+    A fresh recognizer with this session's calibrated energy threshold, once
+    there is one. Recognizers are cheap, and a fresh one per turn keeps
+    sessions from sharing (and overwriting) each other's threshold.
+    """
+    r = sr.Recognizer()
+    if 'mic_energy_threshold' in st.session_state:
+        r.energy_threshold = st.session_state.mic_energy_threshold
+    r.dynamic_energy_threshold = True
+    return r
+
+
+def new_microphone():
+    """
+    A fresh microphone for one recording. An sr.Microphone holds a single
+    audio stream, so it can't be shared between concurrent sessions.
+    """
+    # 16 kHz / 20 ms chunks so each read is one VAD frame
+    return sr.Microphone(sample_rate=VAD_SAMPLE_RATE, chunk_size=VAD_FRAME_SAMPLES)
 
 
 def initialize_microphone():
     """Initialize microphone for speech recognition."""
     try:
-        r = sr.Recognizer()
-        mic = sr.Microphone()
-
-        # Adjust for ambient noise
-        with mic as source:
-            r.adjust_for_ambient_noise(source, duration=1)
-
-        return r, mic
+        return get_recognizer(), new_microphone()
     except Exception as e:
         log_error(f"Error initializing microphone: {str(e)}")
         return None, None
@@ -122,8 +227,23 @@ def transcribe_voice_input(language_code="en-US", engine="google", timeout=10):
 
         # Record audio
         log_info(f"Starting voice recording in {language_code}...")
+
+        if engine == "google_streaming":
+            # Audio is uploaded while the user speaks, so recognition overlaps capture
+            start_time = time.time()
+            with microphone as source:
+                transcription = transcribe_google_streaming(source, language=language_code)
+            log_stt_operation(engine, time.time() - start_time, transcription)
+            return True, transcription.strip(), ""
+
         with microphone as source:
-            audio = recognizer.listen(source, timeout=timeout, phrase_time_limit=8)
+            # Only the energy-threshold fallback (no webrtcvad) needs calibrating;
+            # the 1 s read runs on the session's first turn and is reused after that
+            if not VAD_AVAILABLE and 'mic_energy_threshold' not in st.session_state:
+                recognizer.adjust_for_ambient_noise(source, duration=1)
+                st.session_state.mic_energy_threshold = recognizer.energy_threshold
+            # Stop on 300 ms of trailing silence instead of waiting out the phrase limit
+            audio = listen_with_vad(source, timeout=timeout, phrase_time_limit=8, recognizer=recognizer)
 
         log_info("Audio recorded, transcribing...")
         start_time = time.time()
@@ -132,14 +252,9 @@ def transcribe_voice_input(language_code="en-US", engine="google", timeout=10):
         if engine == "google":
             transcription = recognizer.recognize_google(audio, language=language_code)
         elif engine == "whisper":
-            # For Whisper, save audio to temp file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as tmp_file:
-                with open(tmp_file.name, 'wb') as f:
-                    f.write(audio.get_wav_data())
-
-                from engines.stt_whisper import transcribe_whisper
-                transcription = transcribe_whisper(tmp_file.name)
-                os.unlink(tmp_file.name)
+            # Hand Whisper the PCM in memory - no WAV re-encode, temp file or ffmpeg
+            pcm = np.frombuffer(audio.get_raw_data(convert_rate=16000, convert_width=2), np.int16)
+            transcription = transcribe_whisper(pcm.astype(np.float32) / 32768.0, language=language_code)
         else:
             return False, "", f"Unsupported STT engine: {engine}"
 
@@ -159,6 +274,16 @@ def transcribe_voice_input(language_code="en-US", engine="google", timeout=10):
         return False, "", f"Voice input error: {str(e)}"
 
 
+def prewarm_stt_model(language_code="en-US"):
+    """Load the Whisper model ahead of the first voice turn when it is the configured engine."""
+    if config.STT_ENGINE == "whisper":
+        model_name = whisper_model_name(language_code)
+        if config.WHISPER_BACKEND == "onnx":
+            get_onnx_stt_model(model_name)
+        else:
+            get_stt_model(model_name)
+
+
 def create_integrated_input_component():
     """
     Create an integrated text and voice input component using st.chat_input.
@@ -175,90 +300,26 @@ def create_integrated_input_component():
     if 'show_voice_confirmation' not in st.session_state:
         st.session_state.show_voice_confirmation = False
 
+    # Failed capture from the previous run, reported after its rerun
+    voice_error = st.session_state.pop('voice_error', None)
+    if voice_error:
+        st.toast(f"Voice input failed: {voice_error}", icon="❌")
+
     # Language selection for voice input with comprehensive Indian language support
     col_lang, col_voice = st.columns([3, 1])
 
     with col_lang:
-        # Create organized language options
-        language_options = {
-            # Indian English
-            'en-in': '🇮🇳 Indian English',
-            'en': '🇺🇸 English (US)',
-
-            # Major Indian Languages (22 Official Languages)
-            'hi': '🇮🇳 हिन्दी (Hindi)',
-            'bn': '🇮🇳 বাংলা (Bengali)',
-            'te': '🇮🇳 తెలుగు (Telugu)',
-            'ta': '🇮🇳 தமிழ் (Tamil)',
-            'mr': '🇮🇳 मराठी (Marathi)',
-            'gu': '🇮🇳 ગુജરાતી (Gujarati)',
-            'kn': '🇮🇳 ಕನ್ನಡ (Kannada)',
-            'ml': '🇮🇳 മലയാളം (Malayalam)',
-            'or': '🇮🇳 ଓଡ଼ିଆ (Odia)',
-            'pa': '🇮🇳 ਪੰਜਾਬੀ (Punjabi)',
-            'as': '🇮🇳 অসমীয়া (Assamese)',
-            'ur': '🇮🇳 اردو (Urdu)',
-            'sa': '🇮🇳 संस्कृत (Sanskrit)',
-            'ks': '🇮🇳 कॉशुर (Kashmiri)',
-            'sd': '🇮🇳 سنڌي (Sindhi)',
-            'ne': '🇮🇳 नेपाली (Nepali)',
-            'mni': '🇮🇳 মেইতেই (Manipuri)',
-            'kok': '🇮🇳 कोंकणी (Konkani)',
-            'bodo': '🇮🇳 बड़ो (Bodo)',
-            'doi': '🇮🇳 डोगरी (Dogri)',
-            'mai': '🇮🇳 मैथिली (Maithili)',
-            'sat': '🇮🇳 ᱥᱟᱱᱛᱟᱲᱤ (Santali)',
-
-            # Regional Indian Languages
-            'bh': '🇮🇳 भोजपुरी (Bihari)',
-            'raj': '🇮🇳 राजस्थानी (Rajasthani)',
-            'bhb': '🇮🇳 भीली (Bhili)',
-            'gom': '🇮🇳 गोंयची कोंकणी (Goan Konkani)',
-            'tcy': '🇮🇳 ತುಳು (Tulu)',
-            'new': '🇮🇳 नेवारी (Newari)',
-
-            # International Languages
-            'ar': '🇸🇦 العربية (Arabic)',
-            'zh': '🇨🇳 中文 (Chinese)',
-            'zh-tw': '🇹🇼 繁體中文 (Traditional Chinese)',
-            'es': '🇪🇸 Español (Spanish)',
-            'fr': '🇫🇷 Français (French)',
-            'de': '🇩🇪 Deutsch (German)',
-            'it': '🇮🇹 Italiano (Italian)',
-            'pt': '🇧🇷 Português (Portuguese)',
-            'ru': '🇷🇺 Русский (Russian)',
-            'ja': '🇯🇵 日本語 (Japanese)',
-            'ko': '🇰🇷 한국어 (Korean)',
-            'th': '🇹🇭 ไทย (Thai)',
-            'vi': '🇻🇳 Tiếng Việt (Vietnamese)',
-            'id': '🇮🇩 Bahasa Indonesia',
-            'ms': '🇲🇾 Bahasa Melayu (Malay)',
-            'fil': '🇵🇭 Filipino',
-            'tr': '🇹🇷 Türkçe (Turkish)',
-            'fa': '🇮🇷 فارسی (Persian)',
-            'he': '🇮🇱 עברית (Hebrew)',
-            'sw': '🇰🇪 Kiswahili (Swahili)',
-            'pl': '🇵🇱 Polski (Polish)',
-            'nl': '🇳🇱 Nederlands (Dutch)',
-            'sv': '🇸🇪 Svenska (Swedish)',
-            'da': '🇩🇰 Dansk (Danish)',
-            'no': '🇳🇴 Norsk (Norwegian)',
-            'fi': '🇫🇮 Suomi (Finnish)',
-            'el': '🇬🇷 Ελληνικά (Greek)',
-            'cs': '🇨🇿 Čeština (Czech)',
-            'sk': '🇸🇰 Slovenčina (Slovak)',
-            'hu': '🇭🇺 Magyar (Hungarian)',
-            'ro': '🇷🇴 Română (Romanian)',
-        }
-
         selected_lang = st.selectbox(
             "🌍 Voice Language",
-            options=list(language_options.keys()),
-            format_func=lambda x: language_options.get(x, x.upper()),
+            options=_LANG_CODES,
+            format_func=_LANG_LABELS.__getitem__,
             help="Select language for voice recognition. Indian languages are prioritized at the top.",
             index=0  # Default to Indian English
         )
 
+    # Load the STT model now so the first click on the mic is already hot
+    prewarm_stt_model(bcp47(selected_lang))
+
     with col_voice:
         st.markdown("<br>", unsafe_allow_html=True)
         voice_button_disabled = st.session_state.voice_recording
@@ -278,10 +339,7 @@ def create_integrated_input_component():
     if st.session_state.voice_recording:
         with st.spinner(f"🎤 Listening in {selected_lang.upper()}... Speak now!"):
             # Get language code
-            language_code = LANGUAGE_CODES.get(selected_lang, 'en-US')
-
-            # Import config here to avoid circular imports
-            from utils import config
+            language_code = bcp47(selected_lang)
 
             # Record and transcribe
             success, transcription, error_msg = transcribe_voice_input(
@@ -293,16 +351,17 @@ def create_integrated_input_component():
             # Reset recording state
             st.session_state.voice_recording = False
 
+            # On success the confirmation dialog below renders in this same pass
+            # and its buttons trigger the next rerun
             if success and transcription:
                 st.session_state.pending_voice_text = transcription
                 st.session_state.show_voice_confirmation = True
-                st.success(f"✅ Voice captured: '{transcription}'")
+                st.toast(f"Voice captured: '{transcription}'", icon="✅")
             else:
-                st.error(f"❌ Voice input failed: {error_msg}")
-
-            # Force rerun to update UI
-            time.sleep(0.5)  # Brief pause for user to see the message
-            st.rerun()
+                # Rerun so the mic button (rendered disabled above) and the
+                # sidebar recording banner reset and the user can retry at once
+                st.session_state.voice_error = error_msg or "No speech detected"
+                st.rerun()
 
     # Voice confirmation dialog
     if st.session_state.show_voice_confirmation and st.session_state.pending_voice_text:
@@ -361,18 +420,21 @@ def create_integrated_input_component():
     return None
 
 
+# (button label, query) pairs for the example buttons; widgets have to be
+# re-emitted on every rerun, so only the data is hoisted out of the function
+EXAMPLE_QUERIES = (
+    ("🏪 Burglaries in Mumbai", "Show me burglaries in Mumbai City"),
+    ("💰 Thefts in Bihar", "Show me Thefts in Bihar"),
+    ("🎭 Fraud in Chennai", "Show me Fraud in Chennai")
+)
+
+
 def create_example_queries_section():
     """Create example queries section with better integration."""
     st.markdown("**💡 Try these example queries:**")
 
-    examples = [
-        ("🏪 Burglaries in Mumbai", "Show me burglaries in Mumbai City"),
-        ("💰 Thefts in Bihar", "Show me Thefts in Bihar"),
-        ("🎭 Fraud in Chennai", "Show me Fraud in Chennai")
-    ]
-
     cols = st.columns(3)
-    for i, (label, query) in enumerate(examples):
+    for i, (label, query) in enumerate(EXAMPLE_QUERIES):
         with cols[i % 3]:
             if st.button(label, key=f"example_{i}"):
                 st.session_state.current_query = query
@@ -384,6 +446,7 @@ def test_integrated_input():
     """Test the integrated input component."""
     st.title("🔍 Integrated Voice & Text Input Test")
 
+    prewarm_stt_model()
     query = create_integrated_input_component()
 
     if query:
@@ -0,0 +1,67 @@
+import time
+
+import speech_recognition as sr
+
+try:
+    import webrtcvad
+except ImportError:  # Optional; without it listen_with_vad falls back to recognizer.listen
+    webrtcvad = None
+
+VAD_AVAILABLE = webrtcvad is not None
+
+# WebRTC VAD only accepts 16-bit mono PCM in 10/20/30 ms frames
+VAD_SAMPLE_RATE = 16000
+VAD_FRAME_MS = 20
+VAD_FRAME_SAMPLES = VAD_SAMPLE_RATE * VAD_FRAME_MS // 1000
+
+# 15 x 20 ms = 300 ms of trailing silence ends the phrase
+VAD_TRAILING_SILENCE_FRAMES = 15
+
+
+def listen_with_vad(source, timeout=10, phrase_time_limit=8, aggressiveness=3, recognizer=None):
+    """
+    Record from an open sr.Microphone until the speaker stops talking.
+
+    The microphone must be created with sample_rate=VAD_SAMPLE_RATE and
+    chunk_size=VAD_FRAME_SAMPLES so every read is exactly one VAD frame.
+    Returns an sr.AudioData so downstream recognizers work unchanged.
+    Raises sr.WaitTimeoutError if no speech starts within `timeout` seconds.
+    Without webrtcvad installed, this is `recognizer`.listen, so pass a
+    recognizer whose energy threshold has been calibrated.
+    """
+    if webrtcvad is None:
+        recognizer = recognizer or sr.Recognizer()
+        return recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+
+    vad = webrtcvad.Vad(aggressiveness)
+    frame_bytes = VAD_FRAME_SAMPLES * source.SAMPLE_WIDTH
+
+    pcm = bytearray()
+    speech_started = False
+    silent_frames = 0
+    start_time = time.time()
+    speech_start_time = None
+
+    while True:
+        frame = source.stream.read(VAD_FRAME_SAMPLES)
+        if len(frame) < frame_bytes:
+            break
+
+        if vad.is_speech(frame, VAD_SAMPLE_RATE):
+            if not speech_started:
+                speech_started = True
+                speech_start_time = time.time()
+            silent_frames = 0
+            pcm.extend(frame)
+        elif speech_started:
+            silent_frames += 1
+            pcm.extend(frame)
+            if silent_frames >= VAD_TRAILING_SILENCE_FRAMES:
+                break
+        elif timeout and time.time() - start_time > timeout:
+            raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+
+        if speech_started and phrase_time_limit and time.time() - speech_start_time > phrase_time_limit:
+            break
+
+    return sr.AudioData(bytes(pcm), VAD_SAMPLE_RATE, source.SAMPLE_WIDTH)
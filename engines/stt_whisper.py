@@ -1,7 +1,108 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import streamlit as st
+import torch
 import whisper
 
-def transcribe_whisper(audio_file_path: str, model_name: str = "base"): # type: ignore
-    model = whisper.load_model(model_name)
-    result = model.transcribe(audio_file_path)
-    return result["text"]
+from utils import config
+
+WHISPER_SAMPLE_RATE = 16000
+ONNX_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "whisper-onnx")
+
+# Sizes that also ship an English-only ".en" checkpoint
+ENGLISH_ONLY_SIZES = ("tiny", "base", "small", "medium")
+
+
+def whisper_model_name(language: str = None) -> str:
+    """
+    Pick the Whisper checkpoint for a turn. English turns use the smaller,
+    faster English-only variant of the configured size when one exists.
+    """
+    model_name = config.WHISPER_MODEL_NAME
+    if language and language.lower().startswith("en") and model_name in ENGLISH_ONLY_SIZES:
+        return f"{model_name}.en"
+    return model_name
+
+
+@st.cache_resource(show_spinner=False)
+def get_stt_model(model_name: str = "base"):
+    """Load a Whisper model once per process and warm it up with 1 s of silence."""
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model = whisper.load_model(model_name, device=device)
+    model.transcribe(np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32), fp16=_use_fp16(model))
+    return model
+
+
+def _use_fp16(model) -> bool:
+    """Half precision is only supported (and only faster) on CUDA."""
+    return model.device.type == "cuda"
 
+
+@st.cache_resource(show_spinner=False)
+def get_onnx_stt_model(model_name: str = "base"):
+    """
+    Load Whisper as an INT8-quantized ONNX Runtime model for CPU inference.
+    The export and quantization run once; later sessions reuse the files on disk.
+    Returns (processor, model).
+    """
+    from pathlib import Path
+    from optimum.onnxruntime import ORTModelForSpeechSeq2Seq, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import WhisperProcessor
+
+    model_id = f"openai/whisper-{model_name}"
+    export_dir = Path(ONNX_CACHE_DIR) / model_name
+    quant_dir = Path(ONNX_CACHE_DIR) / f"{model_name}-int8"
+    encoder_file, decoder_file, decoder_with_past_file = (
+        "encoder_model_quantized.onnx",
+        "decoder_model_quantized.onnx",
+        "decoder_with_past_model_quantized.onnx",
+    )
+
+    if not all((quant_dir / name).exists() for name in (encoder_file, decoder_file, decoder_with_past_file)):
+        ort_model = ORTModelForSpeechSeq2Seq.from_pretrained(model_id, export=True, use_merged=False)
+        ort_model.save_pretrained(export_dir)
+
+        # Quantize into a scratch directory and move it into place in one step,
+        # so an interrupted run never leaves a half-written cache behind
+        tmp_dir = tempfile.mkdtemp(dir=ONNX_CACHE_DIR, prefix=f"{model_name}-int8-")
+        # Dynamic INT8 quantization of encoder and decoders (VNNI matmul kernels)
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        for onnx_file in export_dir.glob("*.onnx"):
+            quantizer = ORTQuantizer.from_pretrained(export_dir, file_name=onnx_file.name)
+            quantizer.quantize(save_dir=tmp_dir, quantization_config=qconfig)
+        shutil.rmtree(quant_dir, ignore_errors=True)  # Leftover from an interrupted run
+        os.replace(tmp_dir, quant_dir)
+
+    processor = WhisperProcessor.from_pretrained(model_id)
+    model = ORTModelForSpeechSeq2Seq.from_pretrained(
+        quant_dir,
+        encoder_file_name=encoder_file,
+        decoder_file_name=decoder_file,
+        decoder_with_past_file_name=decoder_with_past_file,
+        provider="CPUExecutionProvider",
+    )
+    return processor, model
+
+
+def transcribe_whisper(audio, model_name: str = None, language: str = None): # type: ignore
+    """
+    Transcribe an audio file path or a float32 mono 16 kHz numpy array.
+    Passing the array skips the temp file and the ffmpeg decode.
+    `language` (e.g. "en-IN") selects the English-only model for English turns.
+    """
+    model_name = model_name or whisper_model_name(language)
+    if config.WHISPER_BACKEND == "onnx":
+        processor, model = get_onnx_stt_model(model_name)
+        if isinstance(audio, str):
+            audio = whisper.load_audio(audio)
+        inputs = processor(audio, sampling_rate=WHISPER_SAMPLE_RATE, return_tensors="pt")
+        predicted_ids = model.generate(inputs.input_features)
+        return processor.batch_decode(predicted_ids, skip_special_tokens=True)[0]
+
+    model = get_stt_model(model_name)
+    result = model.transcribe(audio, fp16=_use_fp16(model))
+    return result["text"]
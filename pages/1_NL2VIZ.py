@@ -1,11 +1,23 @@
+import contextlib
+import copy
+import gc
+from functools import lru_cache
 import streamlit as st
 import torch
-from transformers import AutoTokenizer, AutoModelForCausalLM
+from transformers import (
+    AutoConfig, AutoTokenizer, AutoModelForCausalLM, BitsAndBytesConfig,
+    StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+)
 import sqlite3
 import pandas as pd
+import pyarrow as pa
 import time
 import os
+import queue
 import re
+import shutil
+import tempfile
+import threading
 
 # Page configuration
 st.set_page_config(
@@ -30,136 +42,190 @@ if "tokenizer" not in st.session_state:
 if "db_connected" not in st.session_state:
     st.session_state.db_connected = False
 
+if "expanded_results" not in st.session_state:
+    st.session_state.expanded_results = set()
+
+# Results of the most recent assistant messages are always shown; older ones
+# show their SQL and are only deserialized on request
+RECENT_RESULT_MESSAGES = 5
+
+# Columns the example questions filter on
+INDEXED_COLUMNS = ("date", "crime_category", "status", "location")
+
+def create_indexes(db_path):
+    """Create indexes on INDEXED_COLUMNS (needs a short-lived read-write connection)."""
+    conn = sqlite3.connect(db_path)
+    try:
+        for column in INDEXED_COLUMNS:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{column} ON crime_records({column})")
+        conn.commit()
+    except sqlite3.Error:
+        pass  # Read-only file; queries still work, just without the indexes
+    finally:
+        conn.close()
+
+def open_read_only(db_path):
+    """Read-only SQLite connection tuned for analytic reads."""
+    # Pooled connections move between session threads, but only one uses it at a time
+    conn = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True, check_same_thread=False)
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+    conn.execute("PRAGMA mmap_size=268435456")  # 256 MB memory-mapped reads
+    conn.execute("PRAGMA temp_store=MEMORY")  # Sorts/GROUP BY temp tables in memory
+    return conn
+
+# Idle read-only connections kept per database; extra ones opened under load are closed
+READ_POOL_SIZE = 4
+
+@st.cache_resource(show_spinner=False)
+def get_connection_pool(db_path):
+    """Queue of idle read-only connections to db_path, shared by all sessions."""
+    return queue.Queue(maxsize=READ_POOL_SIZE)
+
+@contextlib.contextmanager
+def read_connection(db_path):
+    """Borrow a read-only connection to db_path from the pool and return it afterwards."""
+    pool = get_connection_pool(db_path)
+    try:
+        conn = pool.get_nowait()
+    except queue.Empty:
+        conn = open_read_only(db_path)
+    try:
+        yield conn
+    finally:
+        try:
+            pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
 # Database connection function
 @st.cache_resource
 def connect_to_database(db_path):
-    """Connect to the SQLite database and return connection info"""
+    """Inspect the SQLite database and return (tables, schema_info, schema_prompt)"""
     try:
-        conn = sqlite3.connect(db_path, check_same_thread=False)
-        
-        # Get table info
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = cursor.fetchall()
-        
-        # Get schema info for crime_records table
-        cursor.execute("PRAGMA table_info(crime_records);")
-        schema_info = cursor.fetchall()
+        create_indexes(db_path)
+        with read_connection(db_path) as conn:
+            # Get table info
+            cursor = conn.cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+            tables = cursor.fetchall()
+            
+            # Get schema info for crime_records table
+            cursor.execute("PRAGMA table_info(crime_records);")
+            schema_info = cursor.fetchall()
         
-        return conn, tables, schema_info
+        return tables, schema_info, build_schema_prompt(schema_info)
     except Exception as e:
         st.error(f"Database connection error: {e}")
         return None, None, None
 
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _execute_sql_cached(query, db_path):
+    """execute_sql_query on a pooled read-only connection, cached per (query, database)."""
+    with read_connection(db_path) as conn:
+        return execute_sql_query(query, conn)
+
+def run_sql_query(query, db_path):
+    """Run a generated query, reusing the result of an identical earlier query."""
+    # Same whitespace normalization as clean_sql_query, so formatting variants share an entry
+    return _execute_sql_cached(" ".join(query.split()), db_path)
+
+def dataframe_to_arrow(df):
+    """Serialize a result DataFrame to Arrow IPC stream bytes for the chat history."""
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        # SQLite columns can mix types (e.g. int and str); keep those as text, NULLs as nulls
+        df = df.copy()
+        object_columns = df.select_dtypes(include="object").columns
+        df[object_columns] = df[object_columns].astype(str).where(df[object_columns].notna(), None)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def arrow_to_table(data):
+    """Read bytes from dataframe_to_arrow back as a pyarrow Table (st.dataframe renders it directly)."""
+    return pa.ipc.open_stream(data).read_all()
+
+# SQL comments and string literals are removed before the keyword check,
+# so "-- drop" or "LIKE '%update%'" don't trip it
+_SQL_COMMENT_OR_STRING_RE = re.compile(r"--[^\n]*|/\*.*?\*/|'(?:[^']|'')*'", re.DOTALL)
+_DANGEROUS_SQL_RE = re.compile(r"\b(DROP|DELETE|UPDATE|INSERT|ALTER|CREATE|TRUNCATE)\b", re.IGNORECASE)
+
 # SQL execution function
 def execute_sql_query(query, conn):
     """Execute SQL query and return results as DataFrame"""
     try:
         # Basic SQL injection prevention
-        dangerous_keywords = ['DROP', 'DELETE', 'UPDATE', 'INSERT', 'ALTER', 'CREATE', 'TRUNCATE']
-        query_upper = query.upper()
-        
-        for keyword in dangerous_keywords:
-            if keyword in query_upper:
-                return None, f"Error: {keyword} operations are not allowed for security reasons."
+        keyword_match = _DANGEROUS_SQL_RE.search(_SQL_COMMENT_OR_STRING_RE.sub(" ", query))
+        if keyword_match:
+            return None, f"Error: {keyword_match.group(1).upper()} operations are not allowed for security reasons."
         
-        df = pd.read_sql_query(query, conn)
+        # Read straight from the driver cursor; no pandas SQL layer in between
+        cursor = conn.execute(query)
+        columns = [description[0] for description in cursor.description or ()]
+        df = pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
         return df, None
     except Exception as e:
         return None, str(e)
 
-# Extract SQL from LLM response
-def extract_sql_from_response(response):
-    """Extract SQL query from LLM response"""
-    # Clean the response
-    response = response.strip()
-    
-    # Look for SQL in code blocks first
-    sql_match = re.search(r'```(?:sql)?\s*(.*?)\s*```', response, re.DOTALL | re.IGNORECASE)
+# SQL extraction patterns, compiled once per process
+_CODEBLOCK_RE = re.compile(r'```(?:sql)?\s*(.*?)\s*```', re.DOTALL | re.IGNORECASE)
+_SELECT_START_RE = re.compile(r'SELECT\s', re.IGNORECASE)
+# Start of the SQL while streaming: an upper-case SELECT, or any case right
+# after a code fence; prose like "to select open cases:" must not match
+_SQL_START_RE = re.compile(r'SELECT\s|```(?:sql)?\s*(?i:select)\s')
+# Case-insensitive keyword presence checks, without upper-casing each candidate
+_HAS_SELECT_RE = re.compile(r'SELECT', re.IGNORECASE)
+_HAS_FROM_RE = re.compile(r'FROM', re.IGNORECASE)
+# Explanation markers or a blank line end the SQL part of a response
+_STOP_RE = re.compile(r"Explanation:|This query|The query|Note:|Here's how|Breakdown:|\n\s*\n")
+_SELECT_RES = (
+    re.compile(r'(SELECT\s+.*?;)', re.DOTALL | re.IGNORECASE),  # SELECT with semicolon
+    re.compile(r'(SELECT\s+.*?(?=\n[A-Z][a-z]))', re.DOTALL | re.IGNORECASE),  # SELECT until next sentence starts
+    re.compile(r'(SELECT\s+.*)', re.DOTALL | re.IGNORECASE),  # Any SELECT statement
+)
+
+ERROR_SQL = "SELECT 'Error: Could not extract valid SQL query from model response' as error_message;"
+
+def _try_codeblock(response):
+    """SQL from a fenced code block, or None."""
+    sql_match = _CODEBLOCK_RE.search(response)
     if sql_match:
         sql = sql_match.group(1).strip()
-        if sql and 'SELECT' in sql.upper():
+        if sql and _HAS_SELECT_RE.search(sql):
             return clean_sql_query(sql)
-    
-    # Split by common separators that indicate end of SQL
-    separators = [
-        'Explanation:',
-        'This query',
-        'The query',
-        'Note:',
-        'Here\'s how',
-        'Breakdown:',
-        '\n\n',  # Double newline often separates SQL from explanation
-    ]
-    
-    # Find the first separator and extract everything before it
-    sql_part = response
-    for sep in separators:
-        if sep in response:
-            sql_part = response.split(sep)[0].strip()
-            break
-    
-    # Look for SELECT statements in the cleaned part
-    sql_patterns = [
-        r'(SELECT\s+.*?;)',  # SELECT with semicolon
-        r'(SELECT\s+.*?(?=\n[A-Z][a-z]))',  # SELECT until next sentence starts
-        r'(SELECT\s+.*)',  # Any SELECT statement
-    ]
-    
-    for pattern in sql_patterns:
-        sql_match = re.search(pattern, sql_part, re.DOTALL | re.IGNORECASE)
-        if sql_match:
-            sql = sql_match.group(1).strip()
-            # Basic validation - must contain FROM and be reasonable length
-            if 'FROM' in sql.upper() and len(sql) < 1000:  # Prevent huge responses
-                return clean_sql_query(sql)
-    
-    # If we still haven't found it, try line-by-line extraction
-    lines = response.split('\n')
-    sql_lines = []
-    collecting = False
-    
-    for line in lines:
-        line = line.strip()
+    return None
+
+def _try_select_regex(response):
+    """
+    Take each SELECT in turn (upper-case ones first, lower-case "select" is
+    often prose), cut it at the first explanation marker and return the first
+    candidate that looks like a complete query, or None.
+    """
+    select_matches = sorted(_SELECT_START_RE.finditer(response), key=lambda m: not m.group().startswith('SELECT'))
+    for select_match in select_matches:
+        sql_part = response[select_match.start():]
+        stop_match = _STOP_RE.search(sql_part)
+        if stop_match:
+            sql_part = sql_part[:stop_match.start()]
         
-        # Start collecting when we see SELECT
-        if not collecting and 'SELECT' in line.upper():
-            collecting = True
-            sql_lines.append(line)
-        elif collecting:
-            # Stop collecting if we hit explanation keywords
-            if any(keyword in line for keyword in ['Explanation:', 'This query', 'The query', 'Note:', 'Here\'s how', 'Breakdown:']):
-                break
-            # Stop if line looks like explanation (starts with "The" followed by explanation)
-            elif line.startswith('The ') and any(word in line for word in ['function', 'clause', 'operator', 'query']):
-                break
-            # Continue collecting if it's SQL-like
-            elif line and (any(keyword in line.upper() for keyword in ['FROM', 'WHERE', 'GROUP BY', 'ORDER BY', 'LIMIT', 'JOIN']) or line.endswith(';')):
-                sql_lines.append(line)
-                # Stop after semicolon
-                if line.endswith(';'):
-                    break
-            # Stop if empty line after we've collected some SQL
-            elif not line and sql_lines:
-                break
-            # Stop if line doesn't look like SQL
-            elif line and not any(c in line for c in ['SELECT', 'FROM', 'WHERE', 'GROUP', 'ORDER', 'LIMIT', '(', ')', ',', '*']):
-                break
-    
-    if sql_lines:
-        sql = ' '.join(sql_lines)
-        if 'FROM' in sql.upper():
-            return clean_sql_query(sql)
-    
-    # Last resort - return first line that looks like complete SQL
-    lines = response.split('\n')
-    for i, line in enumerate(lines):
-        line = line.strip()
-        if 'SELECT' in line.upper() and 'FROM' in line.upper():
-            return clean_sql_query(line)
-    
-    # If nothing found, return a default error query
-    return "SELECT 'Error: Could not extract valid SQL query from model response' as error_message;"
+        for pattern in _SELECT_RES:
+            sql_match = pattern.match(sql_part)
+            if sql_match:
+                sql = sql_match.group(1).strip()
+                # Basic validation - must contain FROM and be reasonable length
+                if len(sql) < 1000 and _HAS_FROM_RE.search(sql):  # Prevent huge responses
+                    return clean_sql_query(sql)
+    return None
+
+# Extract SQL from LLM response
+@lru_cache(maxsize=128)
+def extract_sql_from_response(response):
+    """Extract SQL query from LLM response; ERROR_SQL if none is found"""
+    response = response.strip()
+    return _try_codeblock(response) or _try_select_regex(response) or ERROR_SQL
 
 def clean_sql_query(sql):
     """Clean and format SQL query"""
@@ -177,6 +243,257 @@ def clean_sql_query(sql):
     
     return sql
 
+# Descriptions for the crime_records columns; names and types come from the database
+COLUMN_DESCRIPTIONS = {
+    "id": "Unique identifier",
+    "date": "Date of crime (YYYY-MM-DD format)",
+    "time": "Time of crime (HH:MM format)",
+    "location": "Location where crime occurred",
+    "crime_category": 'Type of crime (e.g., "Vandalism", "Fraud", "Burglary", "Assault")',
+    "crime_subcategory": "Specific subtype of crime",
+    "description": "Detailed description of the crime",
+    "reported_by": "Who reported the crime",
+    "status": 'Case status (e.g., "Open", "Case Filed", "Under Investigation")',
+}
+
+def build_schema_prompt(schema_info, table="crime_records"):
+    """Schema block of the NL2SQL prompt from PRAGMA table_info rows."""
+    lines = ["Database Schema:", f"Table: {table}", "Columns:"]
+    for _, name, column_type, _, _, primary_key in schema_info:
+        if primary_key:
+            column_type += " PRIMARY KEY"
+        description = COLUMN_DESCRIPTIONS.get(name)
+        lines.append(f"- {name} ({column_type}): {description}" if description else f"- {name} ({column_type})")
+    return "\n".join(lines)
+
+# Static part of the NL2SQL prompt; tokenized and run through the model once per
+# model and schema
+NL2SQL_PROMPT_HEAD = """You are a SQL expert. Convert the following natural language question into a SQL query for a crime database.
+
+{schema_prompt}
+
+Rules:
+1. Only generate SELECT queries - no INSERT, UPDATE, DELETE, DROP commands
+2. Use proper SQL syntax for SQLite
+3. Return only the SQL query, nothing else
+4. Use LIKE operator for partial text matches
+5. For counting, use COUNT(*)
+6. For date filtering, remember dates are in 'YYYY-MM-DD' format
+
+"""
+NL2SQL_PROMPT_QUESTION = """Question: {question}
+
+SQL Query:"""
+
+# Temperatures at or below this use greedy decoding
+GREEDY_TEMPERATURE = 0.15
+# Generation stops once the statement is terminated
+SQL_STOP_STRINGS = [";"]
+
+def build_prompt_cache(model, tokenizer, schema_prompt):
+    """
+    Tokenize NL2SQL_PROMPT_HEAD for schema_prompt and run it through the model once.
+    Returns (prefix_ids, prefix_kv); prefix_kv is None for models compiled on a
+    static cache, which allocate their own cache per generate call, and for
+    ONNX Runtime models.
+    """
+    prefix_ids = tokenizer(NL2SQL_PROMPT_HEAD.format(schema_prompt=schema_prompt), return_tensors="pt").input_ids
+    if model.generation_config.cache_implementation == "static" or not isinstance(model, torch.nn.Module):
+        return prefix_ids, None
+    with torch.no_grad():
+        prefix_out = model(prefix_ids.to(model.device), use_cache=True)
+    return prefix_ids, prefix_out.past_key_values
+
+def pad_to_bucket(input_ids, pad_token_id):
+    """
+    Left-pad input_ids to the next power-of-two length so a model compiled on a
+    static cache only ever sees a handful of prompt shapes.
+    Returns (input_ids, attention_mask).
+    """
+    length = input_ids.shape[-1]
+    padding = (1 << (length - 1).bit_length()) - length
+    attention_mask = torch.ones_like(input_ids)
+    if padding:
+        input_ids = torch.nn.functional.pad(input_ids, (padding, 0), value=pad_token_id)
+        attention_mask = torch.nn.functional.pad(attention_mask, (padding, 0), value=0)
+    return input_ids, attention_mask
+
+ONNX_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "nl2sql")
+
+def load_onnx_int8_causal_lm(model_name):
+    """
+    Load a causal LM as an INT8-quantized ONNX Runtime model for CPU inference.
+    The export and quantization run once; later loads reuse the files under
+    ONNX_CACHE_DIR. The returned model supports generate() like the PyTorch one.
+    """
+    from pathlib import Path
+    from optimum.onnxruntime import ORTModelForCausalLM, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    model_slug = model_name.replace("/", "--")
+    export_dir = Path(ONNX_CACHE_DIR) / model_slug
+    quant_dir = Path(ONNX_CACHE_DIR) / f"{model_slug}-int8"
+    quant_file = "model_quantized.onnx"
+
+    if not (quant_dir / quant_file).exists():
+        ort_model = ORTModelForCausalLM.from_pretrained(model_name, export=True)
+        ort_model.save_pretrained(export_dir)
+
+        # Quantize into a scratch directory and move it into place in one step,
+        # so an interrupted run never leaves a half-written cache behind
+        tmp_dir = tempfile.mkdtemp(dir=ONNX_CACHE_DIR, prefix=f"{model_slug}-int8-")
+        # Dynamic INT8 quantization of the projection matmuls (VNNI kernels)
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        for onnx_file in export_dir.glob("*.onnx"):
+            quantizer = ORTQuantizer.from_pretrained(export_dir, file_name=onnx_file.name)
+            quantizer.quantize(save_dir=tmp_dir, quantization_config=qconfig)
+        shutil.rmtree(quant_dir, ignore_errors=True)  # Leftover from an interrupted run
+        os.replace(tmp_dir, quant_dir)
+
+    return ORTModelForCausalLM.from_pretrained(
+        quant_dir,
+        file_name=quant_file,
+        provider="CPUExecutionProvider",
+    )
+
+# Architectures bitsandbytes 4-bit loading is not used for
+NF4_UNSUPPORTED_MODEL_TYPES = ("t5",)
+
+def build_quantization_config(model_name, quantization):
+    """
+    bitsandbytes config for the "int8"/"nf4" sidebar choice, or None for full
+    precision. Quantized weights need CUDA; 4-bit falls back to 8-bit for
+    architectures in NF4_UNSUPPORTED_MODEL_TYPES.
+    """
+    if quantization == "none" or not torch.cuda.is_available():
+        return None
+    if quantization == "nf4":
+        model_type = AutoConfig.from_pretrained(model_name).model_type
+        if model_type not in NF4_UNSUPPORTED_MODEL_TYPES:
+            return BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_quant_type="nf4",
+                bnb_4bit_compute_dtype=torch.float16
+            )
+    return BitsAndBytesConfig(load_in_8bit=True)
+
+def load_causal_lm(model_name, **kwargs):
+    """
+    Load a causal LM with the fastest attention implementation available:
+    FlashAttention-2 on CUDA (needs the flash-attn package), then PyTorch SDPA,
+    then the model's default for architectures that support neither.
+    """
+    implementations = ("flash_attention_2", "sdpa") if torch.cuda.is_available() else ("sdpa",)
+    for attn_implementation in implementations:
+        try:
+            return AutoModelForCausalLM.from_pretrained(model_name, attn_implementation=attn_implementation, **kwargs)
+        except (ImportError, ValueError):
+            continue  # Not installed or not supported by this architecture
+    return AutoModelForCausalLM.from_pretrained(model_name, **kwargs)
+
+def compile_for_generation(model, tokenizer):
+    """
+    On CUDA, compile the forward pass with CUDA graphs (mode="reduce-overhead")
+    on a fixed-shape static KV cache, then run one short generation so the
+    compile cost is paid at load time instead of on the first question.
+    Quantized models and architectures without static-cache support are left as is.
+    """
+    if not torch.cuda.is_available() or getattr(model, "is_quantized", False):
+        return
+    if not (getattr(model, "_can_compile_fullgraph", False) or getattr(model, "_supports_static_cache", False)):
+        return
+
+    model.generation_config.cache_implementation = "static"
+    model.forward = torch.compile(model.forward, mode="reduce-overhead", fullgraph=False)
+
+    warmup_ids = tokenizer("SELECT COUNT(*) FROM crime_records WHERE status = 'Open';", return_tensors="pt").input_ids
+    with torch.inference_mode():  # Same grad mode as generate_streaming, so the graphs are reused
+        model.generate(warmup_ids.to(model.device), max_new_tokens=16, pad_token_id=tokenizer.eos_token_id)
+
+def release_model():
+    """
+    Drop every session reference to the loaded model before loading another,
+    so its weights and KV cache can actually be freed, then hand the cached
+    CUDA blocks back to the driver.
+    """
+    st.session_state.model = None
+    st.session_state.tokenizer = None
+    st.session_state.prefix_kv = None
+    st.session_state.prefix_schema_prompt = None
+    st.session_state.model_loaded = False
+    gc.collect()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+        torch.cuda.ipc_collect()
+
+def ensure_prompt_cache():
+    """Build the prompt prefix cache unless it already matches the connected schema."""
+    schema_prompt = st.session_state.db_schema_prompt
+    if st.session_state.get("prefix_schema_prompt") != schema_prompt:
+        st.session_state.prefix_ids, st.session_state.prefix_kv = build_prompt_cache(
+            st.session_state.model, st.session_state.tokenizer, schema_prompt
+        )
+        st.session_state.prefix_schema_prompt = schema_prompt
+
+class EventStoppingCriteria(StoppingCriteria):
+    """Stop generation once the given threading.Event is set."""
+    def __init__(self, stop_event):
+        self.stop_event = stop_event
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return torch.full((input_ids.shape[0],), self.stop_event.is_set(), dtype=torch.bool, device=input_ids.device)
+
+def sql_complete(text):
+    """True once text has a SELECT followed by ';' or an explanation marker."""
+    select_match = _SQL_START_RE.search(text)
+    if not select_match:
+        return False
+    return ";" in text[select_match.end():] or _STOP_RE.search(text, select_match.end()) is not None
+
+def generate_streaming(model, inputs, tokenizer, on_text, **generate_kwargs):
+    """
+    Run model.generate in a background thread and pass the decoded text so far
+    to on_text after every chunk. Generation stops early once sql_complete()
+    holds. Returns the generate() output; exceptions from the thread are
+    re-raised here.
+    """
+    streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+    stop_event = threading.Event()
+    result = {}
+
+    def target():
+        try:
+            with torch.inference_mode():
+                result["outputs"] = model.generate(
+                    inputs,
+                    tokenizer=tokenizer,
+                    streamer=streamer,
+                    stopping_criteria=StoppingCriteriaList([EventStoppingCriteria(stop_event)]),
+                    **generate_kwargs
+                )
+        except Exception as e:
+            result["error"] = e
+            streamer.end()  # Unblock the consumer loop
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    text = ""
+    try:
+        for chunk in streamer:
+            text += chunk
+            on_text(text)
+            if sql_complete(text):
+                stop_event.set()
+    finally:
+        # Also reached when on_text raises (e.g. a Streamlit rerun mid-generation),
+        # so the generate thread stops instead of running on to max_new_tokens
+        stop_event.set()
+        thread.join()
+
+    if "error" in result:
+        raise result["error"]
+    return result["outputs"]
+
 # Sidebar for configuration
 with st.sidebar:
     st.header("🔍 NL2SQL Configuration")
@@ -188,11 +505,11 @@ with st.sidebar:
     
     if st.button("🔌 Connect to Database"):
         if os.path.exists(db_path):
-            conn, tables, schema_info = connect_to_database(db_path)
-            if conn:
-                st.session_state.db_conn = conn
+            tables, schema_info, schema_prompt = connect_to_database(db_path)
+            if tables is not None:
                 st.session_state.db_tables = tables
                 st.session_state.db_schema = schema_info
+                st.session_state.db_schema_prompt = schema_prompt
                 st.session_state.db_connected = True
                 st.success("✅ Database connected successfully!")
             else:
@@ -216,9 +533,8 @@ with st.sidebar:
         
         # Quick stats
         try:
-            cursor = st.session_state.db_conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM crime_records")
-            total_records = cursor.fetchone()[0]
+            with read_connection(db_path) as conn:
+                total_records = conn.execute("SELECT COUNT(*) FROM crime_records").fetchone()[0]
             st.metric("Total Records", total_records)
         except:
             pass
@@ -264,6 +580,12 @@ with st.sidebar:
     # Generation parameters
     temperature = st.slider("Temperature", 0.1, 1.0, 0.3, 0.1)
     max_tokens = st.slider("Max Tokens", 50, 500, 150, 25)
+    quantization = st.selectbox(
+        "Quantization:",
+        ["none", "int8", "nf4"],
+        index=0,
+        help="Load weights in 8-bit or 4-bit NF4 with bitsandbytes on GPU; on CPU either choice uses an INT8 ONNX Runtime export. Takes effect on the next model load."
+    )
     
     # Load model button
     if st.button("🚀 Load Model", type="primary"):
@@ -274,21 +596,38 @@ with st.sidebar:
                 try:
                     # Clear previous model from memory
                     if st.session_state.model is not None:
-                        del st.session_state.model
-                        del st.session_state.tokenizer
-                        torch.cuda.empty_cache() if torch.cuda.is_available() else None
+                        release_model()
                     
                     # Load tokenizer and model
                     st.session_state.tokenizer = AutoTokenizer.from_pretrained(selected_model)
-                    st.session_state.model = AutoModelForCausalLM.from_pretrained(
-                        selected_model,
-                        torch_dtype=torch.float16 if torch.cuda.is_available() else torch.float32,
-                        device_map="auto" if torch.cuda.is_available() else None
-                    )
+                    if quantization != "none" and not torch.cuda.is_available():
+                        # No bitsandbytes on CPU; INT8 ONNX Runtime is the quantized path there
+                        st.session_state.model = load_onnx_int8_causal_lm(selected_model)
+                    else:
+                        quantization_config = build_quantization_config(selected_model, quantization)
+                        if quantization_config is not None:
+                            # bitsandbytes picks the storage/compute dtypes itself
+                            dtype_kwargs = {"quantization_config": quantization_config}
+                        else:
+                            dtype_kwargs = {"torch_dtype": torch.float16 if torch.cuda.is_available() else torch.float32}
+                        st.session_state.model = load_causal_lm(
+                            selected_model,
+                            device_map="auto" if torch.cuda.is_available() else None,
+                            **dtype_kwargs
+                        )
                     
                     # Add padding token if it doesn't exist
                     if st.session_state.tokenizer.pad_token is None:
                         st.session_state.tokenizer.pad_token = st.session_state.tokenizer.eos_token
+                    # Decoder-only generation continues from the right end of the prompt
+                    st.session_state.tokenizer.padding_side = "left"
+                    
+                    compile_for_generation(st.session_state.model, st.session_state.tokenizer)
+                    # The prompt prefix depends on the schema; without a database
+                    # it is built on the first question instead
+                    st.session_state.prefix_schema_prompt = None
+                    if st.session_state.db_connected:
+                        ensure_prompt_cache()
                     
                     st.session_state.model_loaded = True
                     st.session_state.current_model = selected_model
@@ -308,6 +647,7 @@ with st.sidebar:
     # Clear chat button
     if st.button("🗑️ Clear Chat"):
         st.session_state.messages = []
+        st.session_state.expanded_results = set()
         st.rerun()
 
 # Main interface
@@ -329,7 +669,9 @@ with st.expander("💡 Example Questions"):
 # Display chat messages
 chat_container = st.container()
 with chat_container:
-    for message in st.session_state.messages:
+    assistant_indices = [i for i, message in enumerate(st.session_state.messages) if message["role"] == "assistant"]
+    recent_indices = set(assistant_indices[-RECENT_RESULT_MESSAGES:])
+    for index, message in enumerate(st.session_state.messages):
         with st.chat_message(message["role"]):
             if message["role"] == "assistant":
                 # Display SQL query
@@ -337,10 +679,14 @@ with chat_container:
                     st.code(message["sql_query"], language="sql")
                 
                 # Display results or error
-                if "dataframe" in message and message["dataframe"] is not None:
-                    st.subheader("Query Results:")
-                    st.dataframe(message["dataframe"], use_container_width=True)
-                    st.info(f"Returned {len(message['dataframe'])} rows")
+                if message.get("arrow") is not None:
+                    if index in recent_indices or index in st.session_state.expanded_results:
+                        st.subheader("Query Results:")
+                        st.dataframe(arrow_to_table(message["arrow"]), use_container_width=True)
+                        st.info(f"Returned {message['nrows']} rows")
+                    elif st.button(f"📂 Show {message['nrows']} rows", key=f"expand_result_{index}"):
+                        st.session_state.expanded_results.add(index)
+                        st.rerun()
                 elif "error" in message:
                     st.error(f"Query Error: {message['error']}")
                 else:
@@ -372,57 +718,53 @@ if prompt := st.chat_input("Ask a question about the crime database..."):
         
         with st.spinner("Generating SQL query..."):
             try:
-                # Create NL2SQL prompt
-                nl2sql_prompt = f"""You are a SQL expert. Convert the following natural language question into a SQL query for a crime database.
-
-Database Schema:
-Table: crime_records
-Columns:
-- id (INTEGER PRIMARY KEY): Unique identifier
-- date (TEXT): Date of crime (YYYY-MM-DD format)
-- time (TEXT): Time of crime (HH:MM format)
-- location (TEXT): Location where crime occurred
-- crime_category (TEXT): Type of crime (e.g., "Vandalism", "Fraud", "Burglary", "Assault")
-- crime_subcategory (TEXT): Specific subtype of crime
-- description (TEXT): Detailed description of the crime
-- reported_by (TEXT): Who reported the crime
-- status (TEXT): Case status (e.g., "Open", "Case Filed", "Under Investigation")
-
-Rules:
-1. Only generate SELECT queries - no INSERT, UPDATE, DELETE, DROP commands
-2. Use proper SQL syntax for SQLite
-3. Return only the SQL query, nothing else
-4. Use LIKE operator for partial text matches
-5. For counting, use COUNT(*)
-6. For date filtering, remember dates are in 'YYYY-MM-DD' format
-
-Question: {prompt}
-
-SQL Query:"""
-
-                # Tokenize input
-                inputs = st.session_state.tokenizer.encode(
-                    nl2sql_prompt,
+                # Only the question is tokenized per turn; the static prompt
+                # head and its KV cache are computed once per model and schema
+                ensure_prompt_cache()
+                question_ids = st.session_state.tokenizer(
+                    NL2SQL_PROMPT_QUESTION.format(question=prompt),
                     return_tensors="pt",
-                    truncation=True,
-                    max_length=1024
-                )
-                
-                # Move to GPU if available
-                if torch.cuda.is_available():
-                    inputs = inputs.to(st.session_state.model.device)
+                    add_special_tokens=False
+                ).input_ids
+                inputs = torch.cat([st.session_state.prefix_ids, question_ids], dim=-1)
+                prefix_kv = st.session_state.prefix_kv
+                if st.session_state.model.generation_config.cache_implementation == "static":
+                    # Compiled static-cache models: bucket the prompt length so
+                    # CUDA graphs are reused across questions of similar length
+                    inputs, attention_mask = pad_to_bucket(inputs, st.session_state.tokenizer.pad_token_id)
+                else:
+                    # Nothing to gain from padding; a prefix cache also fixes the first positions
+                    attention_mask = torch.ones_like(inputs)
+                inputs = inputs.to(st.session_state.model.device)
+                attention_mask = attention_mask.to(st.session_state.model.device)
                 
                 # Generate response
-                with torch.no_grad():
-                    outputs = st.session_state.model.generate(
-                        inputs,
-                        max_new_tokens=max_tokens,
-                        temperature=temperature,
-                        do_sample=True,
-                        pad_token_id=st.session_state.tokenizer.eos_token_id,
-                        num_return_sequences=1,
-                        early_stopping=True
-                    )
+                # Near-zero temperatures decode greedily; sampling adds nothing there
+                sample = temperature > GREEDY_TEMPERATURE
+                generate_kwargs = dict(
+                    max_new_tokens=max_tokens,
+                    do_sample=sample,
+                    temperature=temperature if sample else 1.0,
+                    top_p=1.0,
+                    num_beams=1,
+                    use_cache=True,
+                    stop_strings=SQL_STOP_STRINGS,
+                    pad_token_id=st.session_state.tokenizer.eos_token_id,
+                    num_return_sequences=1
+                )
+                # generate() extends the cache in place, so each call gets its own copy
+                past_key_values = copy.deepcopy(prefix_kv) if prefix_kv is not None else None
+                # Partial SQL is shown while it is generated; the attention kernel
+                # is the one chosen at load time (attn_implementation)
+                outputs = generate_streaming(
+                    st.session_state.model,
+                    inputs,
+                    st.session_state.tokenizer,
+                    lambda text: sql_placeholder.code(text, language="sql"),
+                    attention_mask=attention_mask,
+                    past_key_values=past_key_values,
+                    **generate_kwargs
+                )
                 
                 # Decode response
                 response = st.session_state.tokenizer.decode(
@@ -443,7 +785,7 @@ SQL Query:"""
                 
                 # Execute SQL query
                 with st.spinner("Executing query..."):
-                    df, error = execute_sql_query(sql_query, st.session_state.db_conn)
+                    df, error = run_sql_query(sql_query, db_path)
                     
                     if error:
                         result_placeholder.error(f"Query Error: {error}")
@@ -453,7 +795,7 @@ SQL Query:"""
                             "content": "",
                             "sql_query": sql_query,
                             "error": error,
-                            "dataframe": None
+                            "arrow": None
                         }
                     else:
                         # Display results
@@ -462,12 +804,13 @@ SQL Query:"""
                             st.dataframe(df, use_container_width=True)
                             st.info(f"Returned {len(df)} rows")
                         
-                        # Store successful result in message
+                        # Store the result as Arrow bytes rather than a live DataFrame
                         message_data = {
                             "role": "assistant",
                             "content": "",
                             "sql_query": sql_query,
-                            "dataframe": df,
+                            "arrow": dataframe_to_arrow(df),
+                            "nrows": len(df),
                             "error": None
                         }
                 
@@ -479,7 +822,7 @@ SQL Query:"""
                     "content": error_msg,
                     "sql_query": None,
                     "error": error_msg,
-                    "dataframe": None
+                    "arrow": None
                 }
     
     # Add assistant response to chat history
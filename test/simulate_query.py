@@ -127,23 +127,23 @@ mongo_query = {
     ]
 }
 
-results = []
-for record in sample_data:
-    match = False
-    if "$or" in mongo_query:
-        for or_condition in mongo_query["$or"]:
-            for field, regex_obj in or_condition.items():
-                if field in record and "$regex" in regex_obj:
-                    if re.search(regex_obj["$regex"], record[field], re.IGNORECASE):
-                        match = True
-                        break
-            if match:
-                break
-    else:
-        match = True # If no $or, assume all other conditions are direct matches
+# Pull the (field, pattern) pairs out of the query once, compiled, instead of
+# walking the $or/$regex dicts for every record
+or_conditions = [
+    (field, re.compile(condition["$regex"], re.IGNORECASE))
+    for or_condition in mongo_query.get("$or", [])
+    for field, condition in or_condition.items()
+    if "$regex" in condition
+]
 
-    if match:
-        results.append(record)
+if "$or" in mongo_query:
+    # any() stops at the first matching field of each record
+    results = [
+        record for record in sample_data
+        if any(field in record and pattern.search(record[field]) for field, pattern in or_conditions)
+    ]
+else:
+    results = list(sample_data)  # If no $or, assume all other conditions are direct matches
 
 print(json.dumps(results, indent=2))
 
@@ -1,11 +1,71 @@
+import os
+from dataclasses import dataclass, fields
+from typing import Literal, Optional, get_args, get_origin
 
-STT_ENGINE = "google"  # Options: "whisper", "google"
-LLM_ENGINE = "ollama"  # Options: "ollama", "openai"
-LLM_MODEL_NAME = "llama3"  # Example: "mistral", "deepseek-coder", "gpt-3.5-turbo"
-TRANSLATE_TO_ENGLISH = True  # Set to True for multilingual support
 
-MONGODB_URI = "mongodb://localhost:27017/"
-MONGODB_DB_NAME = "crime_data_db"
-MONGODB_COLLECTION_NAME = "crimes"
+@dataclass(frozen=True, slots=True)
+class Config:
+    """
+    Application settings, loaded once at import. Any field can be overridden
+    with a CRIME_<FIELD> environment variable, e.g. CRIME_LLM_ENGINE=openai.
+    Invalid choices raise ValueError at import instead of failing mid-request.
+    """
+    stt_engine: Literal["whisper", "google", "google_streaming"] = "google"  # "google_streaming" is Google Cloud, needs credentials
+    whisper_model_name: str = "base"  # English turns use the ".en" variant, e.g. "base.en"
+    whisper_backend: Literal["pytorch", "onnx"] = "pytorch"  # "onnx": INT8 ONNX Runtime on CPU, needs optimum[onnxruntime]
+    llm_engine: Literal["ollama", "openai"] = "ollama"
+    llm_model_name: str = "llama3"  # Example: "mistral", "deepseek-coder", "gpt-3.5-turbo"
+    translate_to_english: bool = True  # Set to True for multilingual support
 
+    mongodb_uri: str = "mongodb://localhost:27017/"
+    mongodb_db_name: str = "crime_data_db"
+    mongodb_collection_name: str = "crimes"
+    mongodb_max_pool_size: int = 50  # Connections shared by all app sessions
+    mongodb_compressors: str = "zstd,zlib"  # Wire compression; zstd needs the zstandard package, "" disables
 
+    redis_url: Optional[str] = None  # e.g. "redis://localhost:6379/0" to share translations between processes (needs redis)
+
+    def __post_init__(self):
+        for field in fields(self):
+            if get_origin(field.type) is Literal and getattr(self, field.name) not in get_args(field.type):
+                raise ValueError(
+                    f"Invalid {field.name.upper()} {getattr(self, field.name)!r}; expected one of {get_args(field.type)}"
+                )
+
+
+def _parse_env(value: str, field_type):
+    """Convert a CRIME_* environment string to the field's type."""
+    if field_type is bool:
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if field_type is int:
+        return int(value)
+    return value
+
+
+def load_config() -> Config:
+    """Config defaults with CRIME_<FIELD> environment overrides applied."""
+    overrides = {}
+    for field in fields(Config):
+        value = os.environ.get(f"CRIME_{field.name.upper()}")
+        if value is not None:
+            overrides[field.name] = _parse_env(value, field.type)
+    return Config(**overrides)
+
+
+CONFIG = load_config()
+
+# Module-level names used throughout the app (config.LLM_ENGINE, ...)
+STT_ENGINE = CONFIG.stt_engine
+WHISPER_MODEL_NAME = CONFIG.whisper_model_name
+WHISPER_BACKEND = CONFIG.whisper_backend
+LLM_ENGINE = CONFIG.llm_engine
+LLM_MODEL_NAME = CONFIG.llm_model_name
+TRANSLATE_TO_ENGLISH = CONFIG.translate_to_english
+
+MONGODB_URI = CONFIG.mongodb_uri
+MONGODB_DB_NAME = CONFIG.mongodb_db_name
+MONGODB_COLLECTION_NAME = CONFIG.mongodb_collection_name
+MONGODB_MAX_POOL_SIZE = CONFIG.mongodb_max_pool_size
+MONGODB_COMPRESSORS = CONFIG.mongodb_compressors
+
+REDIS_URL = CONFIG.redis_url
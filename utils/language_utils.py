@@ -1,3 +1,9 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
 from langdetect import detect, DetectorFactory
 from googletrans import Translator
 import re
@@ -6,10 +12,18 @@ from utils.logger import log_info, log_error
 # Set seed for consistent language detection
 DetectorFactory.seed = 0
 
+# LRU of (text, target_lang, source_lang) -> translation
+TRANSLATION_CACHE_SIZE = 512
+_translation_cache = OrderedDict()
+# Each Streamlit session runs its own event loop on its own thread
+_translation_cache_lock = threading.Lock()
+
+@lru_cache(maxsize=512)
 def detect_language(text: str) -> str:
     """
     Detect the language of the input text.
     Returns ISO 639-1 language code (e.g., 'en', 'hi', 'te').
+    Results are memoized per text.
     """
     try:
         # Clean text for better detection
@@ -24,20 +38,83 @@ def detect_language(text: str) -> str:
         log_error(f"Error detecting language: {str(e)}")
         return 'en'  # Default to English on error
 
+@lru_cache(maxsize=1)
+def _get_lingua_detector():
+    """
+    lingua detector for the languages in get_supported_languages(), with its
+    models loaded up front, built once per process. None if lingua isn't installed.
+    """
+    try:
+        from lingua import IsoCode639_1, Language, LanguageDetectorBuilder
+    except ImportError:
+        return None
+    languages = [
+        Language.from_iso_code_639_1(getattr(IsoCode639_1, lang['code'].upper()))
+        for lang in get_supported_languages()
+        if hasattr(IsoCode639_1, lang['code'].upper())
+    ]
+    return LanguageDetectorBuilder.from_languages(*languages).with_preloaded_language_models().build()
+
+def detect_languages(texts: list) -> list:
+    """
+    Detect the language of several texts in one call.
+    Uses lingua's multi-threaded batch detection when installed, otherwise
+    detect_language per text. Undetectable texts default to 'en'.
+    """
+    detector = _get_lingua_detector()
+    if detector is None:
+        return [detect_language(text) for text in texts]
+    return [
+        result.iso_code_639_1.name.lower() if result else 'en'
+        for result in detector.detect_languages_in_parallel_of(texts)
+    ]
+
+@dataclass
+class SessionContext:
+    """
+    State shared by the queries of one session. The language is detected from
+    the first query and reused for the rest.
+    """
+    lang: Optional[str] = None
+
+    def detect_language(self, text: str) -> str:
+        if self.lang is None:
+            self.lang = detect_language(text)
+        return self.lang
+
 def translate_text(text: str, target_lang: str = 'en', source_lang: str = 'auto') -> str:
     """
     Translate text from source language to target language.
+    Blocking wrapper around atranslate_text for callers without an event loop.
     """
+    return asyncio.run(atranslate_text(text, target_lang, source_lang))
+
+async def atranslate_text(text: str, target_lang: str = 'en', source_lang: str = 'auto') -> str:
+    """
+    Translate text without blocking the event loop (googletrans 4.x is async-only).
+    Successful translations are memoized; failures are retried on the next call.
+    """
+    key = (text, target_lang, source_lang)
+    with _translation_cache_lock:
+        if key in _translation_cache:
+            _translation_cache.move_to_end(key)
+            return _translation_cache[key]
+
     try:
-        translator = Translator()
-        result = translator.translate(text, src=source_lang, dest=target_lang)
+        async with Translator() as translator:
+            result = await translator.translate(text, src=source_lang, dest=target_lang)
         translated_text = result.text
         log_info(f"Translated '{text}' to '{translated_text}'")
-        return translated_text
     except Exception as e:
         log_error(f"Error translating text: {str(e)}")
         return text  # Return original text on error
 
+    with _translation_cache_lock:
+        _translation_cache[key] = translated_text
+        if len(_translation_cache) > TRANSLATION_CACHE_SIZE:
+            _translation_cache.popitem(last=False)
+    return translated_text
+
 def get_language_name(lang_code: str) -> str:
     """
     Get the full language name from ISO 639-1 code.
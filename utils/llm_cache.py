@@ -0,0 +1,126 @@
+import asyncio
+import re
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from engines.llm_local import aparse_query_with_ollama
+from engines.llm_openai import aparse_query_with_openai
+from utils.language_utils import extract_entities
+from utils.logger import log_info, log_error
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+# Cosine similarity above which an earlier parse is reused
+SIMILARITY_THRESHOLD = 0.95
+# Entries kept; once full the oldest is overwritten (FIFO)
+LLM_CACHE_SIZE = 1024
+
+# Ring buffer of unit-length query embeddings, allocated on the first store
+# and parallel to _cached_parses and _cached_entities; the exhaustive
+# inner-product search is what a flat IP index would do
+_embeddings = None
+_cached_parses = [None] * LLM_CACHE_SIZE
+_cached_entities = [None] * LLM_CACHE_SIZE
+_size = 0  # Filled slots
+_next = 0  # Slot the next store writes to
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _get_embedder():
+    """SentenceTransformer loaded once per process, or None if not installed."""
+    try:
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(EMBEDDING_MODEL_NAME)
+    except Exception as e:
+        log_error(f"Semantic LLM cache disabled: {str(e)}")
+        return None
+
+
+def _normalize(query: str) -> str:
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+def _entity_key(query: str):
+    """
+    Dates, numbers and locations in a query. Embeddings barely separate
+    "thefts in Berlin in 2023" from "thefts in Munich in 2024", so a cached
+    parse is only reused when these match exactly.
+    """
+    entities = extract_entities(re.sub(r"\s+", " ", query).strip())
+    return tuple(tuple(value.lower() for value in entities[kind]) for kind in ("dates", "numbers", "locations"))
+
+
+def _embed(query: str):
+    embedder = _get_embedder()
+    if embedder is None:
+        return None
+    return embedder.encode([_normalize(query)], normalize_embeddings=True)[0].astype(np.float32)
+
+
+def lookup(query: str):
+    """
+    Cached parse of the most similar earlier query with the same entities,
+    or None below SIMILARITY_THRESHOLD.
+    """
+    if _embeddings is None:
+        return None
+    embedding = _embed(query)
+    if embedding is None:
+        return None
+    entities = _entity_key(query)
+    with _lock:
+        same_entities = np.array([cached == entities for cached in _cached_entities[:_size]])
+        if not same_entities.any():
+            return None
+        # Embeddings are unit length, so the dot product is the cosine similarity;
+        # done under the lock since store overwrites rows in place
+        similarities = np.where(same_entities, _embeddings[:_size] @ embedding, -np.inf)
+        best = int(np.argmax(similarities))
+        parsed = _cached_parses[best]
+    if similarities[best] >= SIMILARITY_THRESHOLD:
+        log_info(f"Semantic cache hit ({similarities[best]:.3f}) for: {query}")
+        return dict(parsed)
+    return None
+
+
+def store(query: str, parsed: dict):
+    """Add a successful parse to the cache, evicting the oldest entry when full."""
+    global _embeddings, _size, _next
+    embedding = _embed(query)
+    if embedding is None:
+        return
+    entities = _entity_key(query)
+    with _lock:
+        if _embeddings is None:
+            _embeddings = np.zeros((LLM_CACHE_SIZE, embedding.shape[0]), dtype=np.float32)
+        _embeddings[_next] = embedding
+        _cached_parses[_next] = dict(parsed)
+        _cached_entities[_next] = entities
+        _next = (_next + 1) % LLM_CACHE_SIZE
+        _size = min(_size + 1, LLM_CACHE_SIZE)
+
+
+async def acached_parse(query: str, llm_engine: str, model_name: str):
+    """
+    aparse_query_with_ollama / aparse_query_with_openai behind a semantic cache:
+    a query whose embedding is close enough to an earlier one, with the same
+    dates, numbers and locations, reuses that parse instead of calling the LLM.
+    Errors are not cached.
+    """
+    # Embedding is CPU-bound; keep it off the event loop
+    cached = await asyncio.to_thread(lookup, query)
+    if cached is not None:
+        return cached
+
+    aparse = aparse_query_with_ollama if llm_engine == "ollama" else aparse_query_with_openai
+    parsed = await aparse(query, model_name)
+    if isinstance(parsed, dict) and "error" not in parsed:
+        await asyncio.to_thread(store, query, parsed)
+    return parsed
+
+
+def cached_parse(query: str, llm_engine: str, model_name: str):
+    """Blocking wrapper around acached_parse for callers without an event loop."""
+    return asyncio.run(acached_parse(query, llm_engine, model_name))
@@ -0,0 +1,56 @@
+import hashlib
+from functools import lru_cache
+
+from utils import config
+from utils.language_utils import translate_text
+from utils.logger import log_error
+
+TRANSLATION_TTL_SECONDS = 72 * 3600
+
+
+@lru_cache(maxsize=1)
+def _get_redis():
+    """Redis client for config.REDIS_URL, or None when unset or unreachable."""
+    if not config.REDIS_URL:
+        return None
+    try:
+        import redis
+        client = redis.Redis.from_url(config.REDIS_URL, decode_responses=True)
+        client.ping()
+        return client
+    except Exception as e:
+        log_error(f"Translation cache disabled, Redis unavailable: {str(e)}")
+        return None
+
+
+def translation_cache_key(text: str, target_lang: str) -> str:
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+    return f"trans:{target_lang}:{digest}"
+
+
+def cached_translate(text: str, target_lang: str = 'en') -> str:
+    """
+    translate_text backed by a Redis cache shared between processes, kept for
+    TRANSLATION_TTL_SECONDS. Without Redis this is translate_text, which still
+    memoizes in-process.
+    """
+    client = _get_redis()
+    if client is None:
+        return translate_text(text, target_lang)
+
+    key = translation_cache_key(text, target_lang)
+    try:
+        cached = client.get(key)
+        if cached is not None:
+            return cached
+    except Exception as e:
+        log_error(f"Translation cache read failed: {str(e)}")
+
+    translated_text = translate_text(text, target_lang)
+    # translate_text returns the input unchanged on failure; don't persist that
+    if translated_text != text:
+        try:
+            client.setex(key, TRANSLATION_TTL_SECONDS, translated_text)
+        except Exception as e:
+            log_error(f"Translation cache write failed: {str(e)}")
+    return translated_text